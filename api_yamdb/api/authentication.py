@@ -0,0 +1,141 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import DEFERRED, F
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed, InvalidToken
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import User
+
+# Данные для проверки прав читаются из основной базы: отстающая
+# реплика могла бы вернуть роль или версию токенов до отзыва
+# и они закешировались бы ещё на USER_SNAPSHOT_CACHE_TIMEOUT.
+primary_users = User.objects.db_manager(DEFAULT_DB_ALIAS)
+
+AUTH_CACHE_ALIAS = 'auth'
+
+SNAPSHOT_FIELDS = ('id', 'username', 'role', 'is_staff', 'is_active')
+TOKEN_CLAIMS = ('username', 'role', 'is_staff', 'token_version')
+
+
+def get_auth_cache():
+    return caches[AUTH_CACHE_ALIAS]
+
+
+def get_snapshot_key(user_id):
+    return f'user-snapshot:{user_id}'
+
+
+def get_token_version_key(user_id):
+    return f'token-version:{user_id}'
+
+
+def invalidate_user_snapshot(user_id):
+    """Удаляет из кеша краткую запись о пользователе."""
+    get_auth_cache().delete_many(
+        [get_snapshot_key(user_id), get_token_version_key(user_id)]
+    )
+
+
+def revoke_user_tokens(user_id):
+    """
+    Отзывает выданные пользователю токены с ролью,
+    увеличивая версию токенов пользователя.
+    """
+    User.objects.filter(pk=user_id).update(
+        token_version=F('token_version') + 1
+    )
+    invalidate_user_snapshot(user_id)
+
+
+def get_token_version(user_id):
+    """Возвращает текущую версию токенов пользователя или None."""
+    cache = get_auth_cache()
+    key = get_token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = primary_users.filter(pk=user_id).values_list(
+            'token_version', flat=True
+        ).first()
+        if version is not None:
+            cache.set(key, version, settings.USER_SNAPSHOT_CACHE_TIMEOUT)
+    return version
+
+
+def user_from_snapshot(snapshot):
+    """
+    Собирает объект User из краткой записи.
+    Поля, которых нет в записи, остаются отложенными
+    и загружаются из базы только при обращении к ним.
+    """
+    fields = User._meta.concrete_fields
+    return User.from_db(
+        DEFAULT_DB_ALIAS,
+        [field.attname for field in fields],
+        [snapshot.get(field.attname, DEFERRED) for field in fields]
+    )
+
+
+class RoleAccessToken(AccessToken):
+    """Access-токен, содержащий имя, роль и версию токенов пользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in TOKEN_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class CachedUserJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация с кешированием пользователя.
+    Для проверки прав достаточно id, имени, роли и флагов,
+    поэтому они кешируются и строка User не читается на каждый запрос.
+    Если роль записана в токене, пользователь собирается из токена,
+    а проверяется только версия токенов.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+        if all(claim in validated_token for claim in TOKEN_CLAIMS):
+            return self.get_token_user(user_id, validated_token)
+        cache = get_auth_cache()
+        key = get_snapshot_key(user_id)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = primary_users.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values(*SNAPSHOT_FIELDS).first()
+            if snapshot is None:
+                raise AuthenticationFailed(
+                    _('User not found'), code='user_not_found'
+                )
+            cache.set(key, snapshot, settings.USER_SNAPSHOT_CACHE_TIMEOUT)
+        user = user_from_snapshot(snapshot)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
+
+    def get_token_user(self, user_id, validated_token):
+        if validated_token['token_version'] != get_token_version(user_id):
+            raise AuthenticationFailed(
+                _('Token is revoked'), code='token_revoked'
+            )
+        snapshot = {
+            claim: validated_token[claim] for claim in TOKEN_CLAIMS
+        }
+        snapshot.update(id=user_id, is_active=True)
+        return user_from_snapshot(snapshot)
@@ -0,0 +1,65 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+CATALOG_CACHE_ALIAS = 'catalog'
+STATS_KEYS = ('hits', 'misses')
+
+
+def get_catalog_cache():
+    return caches[CATALOG_CACHE_ALIAS]
+
+
+def get_catalog_key(name, versions, request):
+    """
+    Ключ ответа справочника. Версии берутся из ResourceVersion
+    в базе, поэтому изменение в одном процессе сбрасывает
+    кеш всех процессов, а старые записи вытесняются по времени жизни.
+    """
+    url_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    version = '-'.join(str(value) for value in versions.values())
+    return f'catalog:{name}:{version}:{url_hash}'
+
+
+def count_catalog_request(stat):
+    cache = get_catalog_cache()
+    key = f'catalog-stats:{stat}'
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_catalog_stats():
+    cache = get_catalog_cache()
+    return {
+        stat: cache.get(f'catalog-stats:{stat}', 0) for stat in STATS_KEYS
+    }
+
+
+class CatalogCacheMixin:
+    """
+    Кеширует ответы списка справочника целиком.
+    Ключ строится по полному адресу запроса, поэтому поиск
+    и номер страницы кешируются отдельно, и по версиям данных,
+    которые ConditionalListMixin загрузил для ETag: тело ответа
+    и его ETag всегда соответствуют одной версии.
+    Подключается после ConditionalListMixin.
+    """
+
+    def list(self, request, *args, **kwargs):
+        key = get_catalog_key(
+            self.basename, self.resource_versions, request
+        )
+        cache = get_catalog_cache()
+        data = cache.get(key)
+        if data is not None:
+            count_catalog_request('hits')
+            return Response(data)
+        count_catalog_request('misses')
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        return response
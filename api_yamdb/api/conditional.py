@@ -0,0 +1,66 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from reviews.models import ResourceVersion
+
+
+class ConditionalListMixin:
+    """
+    Добавляет ETag и Last-Modified к ответам list.
+    Валидаторы строятся по счётчикам изменений наборов данных,
+    поэтому на 304 ответ тело не сериализуется и выборка не выполняется.
+    Загруженные счётчики сохраняются в resource_versions,
+    чтобы кеш ответов строил ключ по тем же версиям, что и ETag.
+    """
+    version_names = ()
+
+    def get_version_names(self):
+        return self.version_names
+
+    def get_validators(self, request):
+        names = (ResourceVersion.GLOBAL, *self.get_version_names())
+        versions = dict.fromkeys(names, (0, None))
+        versions.update(
+            (name, (version, updated))
+            for name, version, updated in ResourceVersion.objects.filter(
+                name__in=names
+            ).values_list('name', 'version', 'updated')
+        )
+        self.resource_versions = {
+            name: versions[name][0] for name in names
+        }
+        key = '|'.join(
+            [request.get_full_path(), request.META.get('HTTP_ACCEPT', '')]
+            + [f'{name}={versions[name][0]}' for name in names]
+        )
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        updated = [value for _, value in versions.values() if value]
+        last_modified = int(max(updated).timestamp()) if updated else None
+        return etag, last_modified
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args,
+                                         **kwargs)
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+    """Добавляет ETag и Last-Modified к ответам list и retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args,
+                                         **kwargs)
@@ -1,27 +1,78 @@
-from django_filters.rest_framework import CharFilter, FilterSet, NumberFilter
+from django_filters.rest_framework import (
+    BaseInFilter, CharFilter, FilterSet, NumberFilter
+)
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import SearchFilter
 
 from reviews.models import Title
+from reviews.search import search_titles, search_usernames
+
+
+class CharInFilter(BaseInFilter, CharFilter):
+    """Фильтр по списку строк, перечисленных через запятую."""
+
+
+class NumberInFilter(BaseInFilter, NumberFilter):
+    """Фильтр по списку чисел, перечисленных через запятую."""
 
 
 class TitleFilter(FilterSet):
-    """Фильтр для объектов Title."""
+    """
+    Фильтр для объектов Title.
+    Жанр, категория и год сравниваются точно, чтобы использовать индексы.
+    Поиск по части метки доступен через параметры *__icontains.
+    Параметр search ищет слова в названии и описании
+    по полнотекстовому индексу.
+    """
     name = CharFilter(
         field_name='name',
         lookup_expr='icontains'
     )
-    category = CharFilter(
+    category = CharFilter(field_name='category__slug')
+    category__in = CharInFilter(field_name='category__slug')
+    category__icontains = CharFilter(
         field_name='category__slug',
         lookup_expr='icontains'
     )
-    genre = CharFilter(
+    genre = CharFilter(field_name='genre__slug')
+    genre__in = CharInFilter(field_name='genre__slug', distinct=True)
+    genre__icontains = CharFilter(
         field_name='genre__slug',
-        lookup_expr='icontains'
-    )
-    year = NumberFilter(
-        field_name='year',
-        lookup_expr='icontains'
+        lookup_expr='icontains',
+        distinct=True
     )
+    year = NumberFilter(field_name='year')
+    year__in = NumberInFilter(field_name='year')
+    year__gte = NumberFilter(field_name='year', lookup_expr='gte')
+    year__lte = NumberFilter(field_name='year', lookup_expr='lte')
+    search = CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         fields = ['name', 'year', 'genre', 'category']
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class UsernameSearchFilter(SearchFilter):
+    """
+    Поиск пользователей по имени.
+    По умолчанию ищет по началу имени, что использует индекс;
+    search_mode=contains включает поиск подстроки.
+    """
+    mode_param = 'search_mode'
+    modes = ('prefix', 'contains')
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.search_param, '').strip()
+        if not value:
+            return queryset
+        mode = request.query_params.get(self.mode_param, self.modes[0])
+        if mode not in self.modes:
+            raise ValidationError({
+                self.mode_param: [
+                    f'Допустимые значения: {", ".join(self.modes)}.'
+                ]
+            })
+        return search_usernames(queryset, value, mode == 'contains')
@@ -0,0 +1,165 @@
+import hashlib
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    LimitOffsetPagination,
+    PageNumberPagination
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def approximate_count(queryset):
+    """
+    Возвращает количество объектов выборки.
+    Для нефильтрованной таблицы PostgreSQL берётся оценка планировщика
+    из pg_class, остальные подсчёты кешируются на короткое время.
+    """
+    connection = connections[queryset.db]
+    if not queryset.query.where and connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= settings.APPROXIMATE_COUNT_THRESHOLD:
+            return int(row[0])
+    key = 'count:' + hashlib.md5(
+        f'{queryset.db}:{queryset.query}'.encode()
+    ).hexdigest()
+    return cache.get_or_set(
+        key, queryset.count, settings.PAGINATION_COUNT_CACHE_TIMEOUT
+    )
+
+
+class SelectablePagination(BasePagination):
+    """
+    Пагинация, режим которой выбирается параметром запроса.
+    Без параметра или с неизвестным режимом используется default_class.
+    """
+    mode_query_param = 'pagination'
+    default_class = None
+    modes = {}
+
+    def get_paginator_class(self, request, view=None):
+        """
+        Режим берётся из параметра запроса, а если он не передан -
+        из атрибута pagination_mode представления.
+        """
+        mode = request.query_params.get(
+            self.mode_query_param, getattr(view, 'pagination_mode', None)
+        )
+        return self.modes.get(mode, self.default_class)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator_class(request, view)()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+
+class PublicationCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация по дате публикации.
+    Страница выбирается условием по pub_date, поэтому глубокие
+    страницы не требуют OFFSET, а общее количество не считается.
+    """
+    ordering = ('-pub_date', '-id')
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class PublicationPagination(SelectablePagination):
+    """Пагинация отзывов и комментариев: limit/offset или курсор."""
+    default_class = LimitOffsetPagination
+    modes = {'cursor': PublicationCursorPagination}
+
+
+class CountFreePagination(PageNumberPagination):
+    """
+    Постраничная пагинация без подсчёта объектов.
+    Запрашивается на один объект больше размера страницы,
+    чтобы узнать, есть ли следующая страница.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        try:
+            self.page_number = int(
+                request.query_params.get(self.page_query_param, 1)
+            )
+        except ValueError:
+            self.page_number = 0
+        if self.page_number < 1:
+            raise NotFound(self.invalid_page_message)
+        offset = (self.page_number - 1) * page_size
+        objects = list(queryset[offset:offset + page_size + 1])
+        if not objects and self.page_number > 1:
+            raise NotFound(self.invalid_page_message)
+        self.has_next = len(objects) > page_size
+        self.request = request
+        return objects[:page_size]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.page_query_param,
+            self.page_number + 1
+        )
+
+    def get_previous_link(self):
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.page_query_param, self.page_number - 1
+        )
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+
+class ApproximateCountPaginator(Paginator):
+    """Django-пагинатор с приблизительным или кешированным count."""
+
+    @cached_property
+    def count(self):
+        return approximate_count(self.object_list)
+
+
+class ApproximateCountPagination(PageNumberPagination):
+    """Постраничная пагинация с приблизительным количеством объектов."""
+    django_paginator_class = ApproximateCountPaginator
+
+
+class CatalogPagination(SelectablePagination):
+    """
+    Пагинация произведений, категорий и жанров.
+    Режим nocount не считает объекты, approximate - оценивает
+    или кеширует их количество.
+    """
+    default_class = PageNumberPagination
+    modes = {
+        'nocount': CountFreePagination,
+        'approximate': ApproximateCountPagination,
+    }
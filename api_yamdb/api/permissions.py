@@ -36,10 +36,11 @@ class IsAuthorOrIsAdminOrIsModeratorOrRead(IsAdmin):
         """
         Метод разрешений.
         Метод определяет разрешения на уровне объекта.
+        Автор сравнивается по author_id, чтобы не загружать его из базы.
         """
         return (
-            obj.author == request.user
-            or request.method in permissions.SAFE_METHODS
+            request.method in permissions.SAFE_METHODS
+            or obj.author_id == request.user.id
             or request.user.is_authenticated and request.user.is_moderator
             or super().has_permission(request, view)
         )
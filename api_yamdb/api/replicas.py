@@ -0,0 +1,73 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_COOKIE = 'primary_db_pin'
+
+routing_state = ContextVar('routing_state', default=None)
+
+
+class RoutingState:
+    """Состояние маршрутизации запросов к БД в рамках одного запроса."""
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+class ReplicaRouter:
+    """
+    Направляет чтение в безопасных запросах на реплику,
+    а запись и чтение после записи - в основную базу.
+    Вне запросов (команды, миграции) используется основная база.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = routing_state.get()
+        if (
+            settings.REPLICA_DATABASE
+            and state is not None
+            and state.use_replica
+            and not state.wrote
+        ):
+            return settings.REPLICA_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = routing_state.get()
+        if state is not None:
+            state.wrote = True
+        return None
+
+
+class ReplicaMiddleware:
+    """
+    Разрешает чтение с реплики для GET, HEAD и OPTIONS запросов.
+    После записи клиент получает cookie и следующие
+    REPLICA_PIN_TIMEOUT секунд читает из основной базы,
+    чтобы видеть свои изменения до того, как они дойдут до реплики.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState(
+            request.method in SAFE_METHODS
+            and PIN_COOKIE not in request.COOKIES
+        )
+        token = routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        if state.wrote and settings.REPLICA_DATABASE:
+            response.set_cookie(
+                PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_PIN_TIMEOUT,
+                httponly=True,
+                samesite='Lax'
+            )
+        return response
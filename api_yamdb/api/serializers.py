@@ -9,7 +9,9 @@ from reviews.constans import (
     NAME_LENGTH,
     EMAIL_LENGTH
 )
-from reviews.models import Categorie, Comment, Genre, Title, Review, User
+from reviews.models import (
+    Categorie, Comment, Genre, Title, TitleStats, Review, User
+)
 from reviews.validators import validate_username
 
 
@@ -65,6 +67,24 @@ class ReadTitleSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class TitleStatsSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор для статистики отзывов произведения:
+    количество отзывов, средняя оценка, число оценок
+    каждого значения и дата последнего отзыва.
+    """
+    rating = serializers.FloatField(read_only=True)
+    scores = serializers.DictField(
+        child=serializers.IntegerField(),
+        read_only=True
+    )
+
+    class Meta:
+        model = TitleStats
+        fields = ('review_count', 'rating', 'scores', 'latest_review')
+        read_only_fields = fields
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Сериализатор для модели User."""
 
@@ -136,20 +156,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'score', 'pub_date')
         model = Review
 
-    def validate(self, data):
-        """Проверка отзыва."""
-        request = self.context['request']
-        if request.method == "PATCH":
-            return data
-        visitor = request.user
-        title = (
-            request.parser_context['kwargs']['title_id']
-        )
-        if Review.objects.filter(author=visitor, title=title):
-            raise serializers.ValidationError(
-                'Пользователь может оставлять только один отзыв!')
-        return data
-
 
 class CommentSerializer(serializers.ModelSerializer):
     """Сериализатор модели Comment."""
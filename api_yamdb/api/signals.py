@@ -0,0 +1,143 @@
+from django.db import connections
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_save
+)
+from django.dispatch import receiver
+
+from reviews.models import (
+    Categorie,
+    Comment,
+    Genre,
+    ResourceVersion,
+    Review,
+    Title,
+    TitleStats,
+    User
+)
+from reviews.search import (
+    index_title,
+    index_user,
+    unindex_title,
+    unindex_user
+)
+
+WRITE_SIGNALS = (post_save, post_delete)
+
+
+@receiver(WRITE_SIGNALS, sender=Title)
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_changed(sender, **kwargs):
+    ResourceVersion.bump('titles')
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, created, **kwargs):
+    index_title(instance)
+    if created:
+        TitleStats.objects.create(title=instance)
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    unindex_title(instance.pk)
+
+
+@receiver(WRITE_SIGNALS, sender=Categorie)
+def category_changed(sender, **kwargs):
+    ResourceVersion.bump('categories', 'titles')
+
+
+@receiver(WRITE_SIGNALS, sender=Genre)
+def genre_changed(sender, **kwargs):
+    ResourceVersion.bump('genres', 'titles')
+
+
+@receiver(WRITE_SIGNALS, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    ResourceVersion.bump(
+        f'reviews:{instance.title_id}',
+        Title.rating_version_name(instance.title_id)
+    )
+
+
+@receiver(pre_save, sender=Review)
+def review_saving(sender, instance, using, update_fields=None, **kwargs):
+    """
+    Запоминает сохранённую оценку изменяемого отзыва.
+    Внутри транзакции строка блокируется до её конца,
+    чтобы одновременные изменения не потеряли разницу оценок.
+    """
+    if instance._state.adding or (
+        update_fields is not None and 'score' not in update_fields
+    ):
+        return
+    reviews = Review.objects.using(using).filter(pk=instance.pk)
+    if connections[using].in_atomic_block:
+        reviews = reviews.select_for_update()
+    instance._saved_score = reviews.values_list('score', flat=True).first()
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """
+    Добавляет оценку нового отзыва в рейтинг и статистику
+    произведения или переносит её при изменении оценки,
+    как бы ни был сохранён отзыв: через API, ORM или загрузку фикстур.
+    """
+    if created:
+        Title.change_rating(instance.title_id, instance.score, 1)
+        TitleStats.add_review(instance)
+        return
+    old_score = getattr(instance, '_saved_score', None)
+    if old_score is None or old_score == instance.score:
+        return
+    Title.change_rating(instance.title_id, instance.score - old_score)
+    TitleStats.change_score(instance.title_id, old_score, instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """
+    Вычитает оценку удалённого отзыва из рейтинга и статистики
+    произведения, в том числе при каскадном удалении вместе с автором.
+    """
+    Title.change_rating(instance.title_id, -instance.score, -1)
+    TitleStats.remove_review(instance)
+
+
+@receiver(WRITE_SIGNALS, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    ResourceVersion.bump(f'comments:{instance.review_id}')
+
+
+@receiver(WRITE_SIGNALS, sender=User)
+def user_changed(sender, **kwargs):
+    ResourceVersion.bump('users')
+
+
+@receiver(post_save, sender=User)
+def username_changed(sender, instance, created, update_fields=None,
+                     **kwargs):
+    """
+    Отзывы и комментарии показывают только имя автора,
+    поэтому их версии зависят от счётчика имён, а не всех
+    изменений пользователя (регистрация, код подтверждения).
+    """
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    if not created and (
+        instance.username != getattr(instance, '_loaded_username', None)
+    ):
+        ResourceVersion.bump('usernames')
+    instance._loaded_username = instance.username
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'username' in update_fields:
+        index_user(instance)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    unindex_user(instance.pk)
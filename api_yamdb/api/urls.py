@@ -6,6 +6,7 @@ from .views import (
     CommentViewSet,
     GenreViewSet,
     TitleViewSet,
+    catalog_cache_stats,
     obtain_token,
     ReviewViewSet,
     UserRegistrationView,
@@ -37,5 +38,10 @@ auth_patterns = [
 
 urlpatterns = [
     path('v1/auth/', include(auth_patterns)),
+    path(
+        'v1/catalog-cache/',
+        catalog_cache_stats,
+        name='catalog_cache_stats'
+    ),
     path('v1/', include(router_v1.urls)),
 ]
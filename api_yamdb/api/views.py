@@ -2,40 +2,51 @@ import random
 
 from django.conf import settings
 from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
 from django.db.utils import IntegrityError
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status, filters, mixins, serializers
 from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import (
     AllowAny, IsAuthenticated, IsAuthenticatedOrReadOnly
 )
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
 
+from .authentication import (
+    RoleAccessToken,
+    invalidate_user_snapshot,
+    revoke_user_tokens
+)
+from .caching import CatalogCacheMixin, get_catalog_stats
+from .conditional import ConditionalGetMixin, ConditionalListMixin
+from .pagination import CatalogPagination, PublicationPagination
 from .permissions import (
     IsAdmin,
     IsAdminOrReadOnly,
     IsAuthorOrIsAdminOrIsModeratorOrRead
 )
 
-from reviews.models import Categorie, Genre, Title, Review, User
+from reviews.models import (
+    Categorie, Genre, OutgoingEmail, Title, TitleStats, Review, User
+)
 from reviews.constans import ALLOWED_REQUESTS
 from .serializers import (
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
     TitleSerializer,
+    TitleStatsSerializer,
     TokenSerializer,
     ReadTitleSerializer,
     ReviewSerializer,
     UserSerializer,
     SignupSerializer
 )
-from .filters import TitleFilter
+from .filters import TitleFilter, UsernameSearchFilter
 
 
 @api_view(['POST'])
@@ -45,13 +56,24 @@ def obtain_token(request):
     serializer = TokenSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
     user = get_object_or_404(
+        User,
         username=serializer.validated_data['username']
     )
+    token_class = (
+        RoleAccessToken if settings.ROLE_CLAIMS_IN_TOKEN else AccessToken
+    )
     return Response({
-        'token': str(RefreshToken.for_user(user).access_token)
+        'token': str(token_class.for_user(user))
     }, status=status.HTTP_200_OK)
 
 
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def catalog_cache_stats(request):
+    """Функция для получения счётчиков кеша справочников."""
+    return Response(get_catalog_stats(), status=status.HTTP_200_OK)
+
+
 def generate_confirmation_code():
     """Генерация кода подтверждения заданной длины."""
     return ''.join(random.choices(
@@ -94,22 +116,37 @@ class UserRegistrationView(APIView):
 
     @staticmethod
     def send_confirmation_email(email, confirmation_code):
-        """Отправляет email с кодом подтверждения."""
+        """
+        Отправляет email с кодом подтверждения.
+        В режиме outbox письмо только ставится в очередь,
+        а отправляет его команда send_emails.
+        """
+        subject = 'Код подтверждения регистрации'
+        message = f'Ваш код подтверждения: {confirmation_code}'
+        if settings.CONFIRMATION_EMAIL_DELIVERY == 'outbox':
+            OutgoingEmail.objects.create(
+                subject=subject,
+                message=message,
+                from_email=settings.CONFIRMATION_EMAIL_SENDER,
+                recipient=email
+            )
+            return
         send_mail(
-            'Код подтверждения регистрации',
-            f'Ваш код подтверждения: {confirmation_code}',
+            subject,
+            message,
             settings.CONFIRMATION_EMAIL_SENDER,
             [email]
         )
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet для управления пользователями."""
+    version_names = ('users',)
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (IsAdmin,)
     lookup_field = 'username'
-    filter_backends = (filters.SearchFilter,)
+    filter_backends = (UsernameSearchFilter,)
     search_fields = ('username',)
     http_method_names = ['get', 'post', 'patch', 'delete']
 
@@ -122,32 +159,59 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def current_user(self, request):
         """Метод для работы с текущим пользователем."""
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method != 'PATCH':
             return Response(
-                self.get_serializer(request.user).data,
+                self.get_serializer(user).data,
                 status=status.HTTP_200_OK
             )
         serializer = self.get_serializer(
-            request.user,
+            user,
             data=request.data,
             partial=True,
         )
         serializer.is_valid(raise_exception=True)
         serializer.save(
-            role=request.user.role,
+            role=user.role,
             partial=True,
         )
+        invalidate_user_snapshot(user.pk)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def perform_update(self, serializer):
+        """
+        Переопределение функции изменения пользователя.
+        При смене роли выданные токены с ролью отзываются.
+        """
+        user = serializer.instance
+        old_rights = (user.role, user.is_staff)
+        super().perform_update(serializer)
+        if (user.role, user.is_staff) != old_rights:
+            revoke_user_tokens(user.pk)
+        else:
+            invalidate_user_snapshot(user.pk)
+
+    def perform_destroy(self, instance):
+        """Переопределение функции удаления пользователя."""
+        user_id = instance.pk
+        super().perform_destroy(instance)
+        invalidate_user_snapshot(user_id)
+
 
 class BaseEditingKitViewSet(
+    ConditionalListMixin,
+    CatalogCacheMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     viewsets.GenericViewSet,
 ):
-    """Базовый ViewSet, для перечисления, создания и удаления."""
+    """
+    Базовый ViewSet, для перечисления, создания и удаления.
+    Ответы списка кешируются и сбрасываются при создании и удалении.
+    """
     permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = CatalogPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
@@ -155,76 +219,168 @@ class BaseEditingKitViewSet(
 
 class CategoryViewSet(BaseEditingKitViewSet):
     """ViewSet для категорий."""
+    version_names = ('categories',)
     queryset = Categorie.objects.all()
     serializer_class = CategorySerializer
 
 
 class GenreViewSet(BaseEditingKitViewSet):
     """ViewSet для жанров."""
+    version_names = ('genres',)
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet для произведений."""
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')
-    ).order_by(*Title._meta.ordering)
+    version_names = ('titles',)
+    queryset = Title.objects.all()
+    read_queryset = queryset.select_related(
+        'category'
+    ).prefetch_related('genre')
     permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = CatalogPagination
     serializer_class = TitleSerializer
     filterset_class = TitleFilter
     filter_backends = [DjangoFilterBackend]
     http_method_names = ALLOWED_REQUESTS
+    lookup_value_regex = r'\d+'
+
+    def get_queryset(self):
+        """
+        Метод получения выборки произведений.
+        Для чтения категория и жанры загружаются заранее,
+        чтобы страница списка не порождала запрос на каждое произведение.
+        """
+        if self.action in ('retrieve', 'list'):
+            return self.read_queryset.all()
+        return super().get_queryset()
+
+    def get_version_names(self):
+        """
+        Рейтинг меняется при каждом отзыве, поэтому версия ответа
+        учитывает счётчики рейтинга: для списка - все группы,
+        для одного произведения - его группу. Счётчик увеличивается
+        в транзакции отзыва, поэтому версия меняется с каждой
+        зафиксированной записью независимо от порядка фиксации и часов.
+        """
+        if self.action == 'retrieve':
+            return (
+                *self.version_names,
+                Title.rating_version_name(self.kwargs['pk'])
+            )
+        return (*self.version_names, *Title.rating_version_names())
 
     def get_serializer_class(self):
         """Метод определения класса сериализатора."""
         if self.action in ('retrieve', 'list'):
             return ReadTitleSerializer
+        if self.action == 'stats':
+            return TitleStatsSerializer
         return TitleSerializer
 
-
-class ReviewViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """
+        Статистика отзывов произведения.
+        Читается одна заранее посчитанная строка по первичному ключу.
+        Если строки ещё нет (загрузка не закончена), статистика
+        считается по отзывам без записи в базу.
+        """
+        stats = TitleStats.objects.filter(title_id=pk).first()
+        if stats is None:
+            get_object_or_404(Title.objects.only('id'), pk=pk)
+            stats, = TitleStats.calculate([pk])
+        return Response(self.get_serializer(stats).data)
+
+
+class ReviewViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Обрабатывает API запросы к моделе Review."""
     permission_classes = [
         IsAuthenticatedOrReadOnly,
         IsAuthorOrIsAdminOrIsModeratorOrRead
     ]
     serializer_class = ReviewSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = PublicationPagination
     http_method_names = ALLOWED_REQUESTS
 
+    def get_version_names(self):
+        return (f'reviews:{self.kwargs["title_id"]}', 'usernames')
+
     def get_post(self):
         """Возвращает объект Title c id из запроса."""
-        return get_object_or_404(Title, id=self.kwargs['title_id'])
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(Title, id=self.kwargs['title_id'])
+        return self._title
 
     def get_queryset(self):
         """Переопределение функции возврата списка отзывов."""
-        return self.get_post().reviews.all()
+        return self.get_post().reviews.select_related('author')
 
     def perform_create(self, serializer):
-        """Переопределение функции создания отзыва."""
-        serializer.save(
-            author=self.request.user,
-            title=self.get_post())
-
-
-class CommentViewSet(viewsets.ModelViewSet):
+        """
+        Переопределение функции создания отзыва.
+        Повторный отзыв автора отклоняет ограничение unique_author_title,
+        поэтому отдельный запрос на проверку выполняется только после
+        ошибки, чтобы не выдавать другие нарушения за повторный отзыв.
+        Рейтинг и статистика произведения обновляются сигналами
+        в той же транзакции.
+        """
+        title = self.get_post()
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            if not Review.objects.filter(
+                author=self.request.user, title=title
+            ).exists():
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Пользователь может оставлять только один отзыв!'
+                ]
+            })
+
+    def perform_update(self, serializer):
+        """
+        Переопределение функции изменения отзыва.
+        Транзакция нужна, чтобы сигнал заблокировал строку отзыва
+        до обновления рейтинга.
+        """
+        with transaction.atomic():
+            serializer.save()
+
+
+class CommentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Обрабатывает API запросы к моделе Comment."""
     permission_classes = [
         IsAuthenticatedOrReadOnly,
         IsAuthorOrIsAdminOrIsModeratorOrRead
     ]
     serializer_class = CommentSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = PublicationPagination
     http_method_names = ALLOWED_REQUESTS
 
+    def get_version_names(self):
+        return (f'comments:{self.kwargs["review_id"]}', 'usernames')
+
     def get_post(self):
-        """Возвращает объект Post c id из запроса."""
-        return get_object_or_404(Review, id=self.kwargs['review_id'])
+        """
+        Возвращает объект Review c id из запроса.
+        Отзыв и его произведение находятся одним запросом,
+        результат сохраняется на время обработки запроса.
+        """
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.select_related('title'),
+                id=self.kwargs['review_id'],
+                title_id=self.kwargs['title_id']
+            )
+        return self._review
 
     def get_queryset(self):
         """Переопределение функции возврата списка комментариев."""
-        return self.get_post().comments.all()
+        return self.get_post().comments.select_related('author')
 
     def perform_create(self, serializer):
         """Переопределение функции создания комментария."""
@@ -4,3 +4,4 @@ MIN_SCORE = 1
 MAX_SCORE = 10
 SLICE_NAME_OBJECT = 15
 EMAIL_LENGTH = 254
+RATING_VERSION_SHARDS = 16
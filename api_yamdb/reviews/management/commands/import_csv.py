@@ -1,18 +1,31 @@
+import argparse
 import csv
 import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+)
+from itertools import islice
 
+import django
+from django.core.exceptions import ValidationError
 from django.core.management import BaseCommand
-from django.db import IntegrityError
+from django.core.management.color import no_style
+from django.db import IntegrityError, connection, connections, transaction
 
 from api_yamdb.settings import BASE_DIR
+from reviews.management.commands.rebuild_ratings import rebuild_ratings
 from reviews.models import (
     Categorie,
     Comment,
     Genre,
+    ImportCheckpoint,
+    ResourceVersion,
     Review,
     Title,
     User
 )
+from reviews.search import rebuild_search_index, rebuild_user_search_index
 
 
 ThroughModel = Title.genre.through
@@ -28,54 +41,267 @@ FILES_CLASSES = {
 }
 
 KEY_FIELDS = {
-    'category': ('category', Categorie),
-    'title_id': ('title', Title),
-    'genre_id': ('genre', Genre),
-    'author': ('author', User),
-    'review_id': ('review', Review),
+    'category': ('category_id', Categorie),
+    'title_id': ('title_id', Title),
+    'genre_id': ('genre_id', Genre),
+    'author': ('author_id', User),
+    'review_id': ('review_id', Review),
 }
 
-local_csv_dir = os.path.join(BASE_DIR, 'static\\data\\')
+BATCH_SIZE = 1000
+
+local_csv_dir = os.path.join(BASE_DIR, 'static', 'data')
+
+
+def positive_int(value):
+    """Тип аргумента командной строки: целое число не меньше единицы."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f'Ожидается целое число больше нуля, получено {value}.'
+        )
+    return number
 
 
 def open_csv(file_name):
+    """Построчно читает csv-файл, не загружая его в память целиком."""
+    csv_path = os.path.join(local_csv_dir, file_name + '.csv')
+    with open(csv_path, encoding='utf-8', newline='') as file:
+        yield from csv.DictReader(file)
+
+
+def read_header(file_name):
     csv_path = os.path.join(local_csv_dir, file_name + '.csv')
     try:
-        with (open(csv_path, encoding='utf-8')) as file:
-            return list(csv.reader(file))
+        with open(csv_path, encoding='utf-8', newline='') as file:
+            return next(csv.reader(file), [])
     except FileNotFoundError:
-        print(f'Файл {file_name}.csv не найден.')
-        return
+        return []
+
+
+def build_dependencies():
+    """
+    Строит граф зависимостей таблиц по колонкам внешних ключей.
+    Для каждого файла возвращает множество файлов, которые
+    должны быть загружены раньше него.
+    """
+    files_by_class = {value: key for key, value in FILES_CLASSES.items()}
+    return {
+        file_name: {
+            files_by_class[KEY_FIELDS[column][1]]
+            for column in read_header(file_name)
+            if column in KEY_FIELDS
+        }
+        for file_name in FILES_CLASSES
+    }
 
 
 def change_fk_values(data_csv):
-    data_csv_copy = data_csv.copy()
-    for field_key, field_value in data_csv.items():
-        if field_key in KEY_FIELDS.keys():
-            field_key0 = KEY_FIELDS[field_key][0]
-            data_csv_copy[field_key0] = KEY_FIELDS[field_key][1].objects.get(
-                pk=field_value)
-    return data_csv_copy
-
-
-def import_csv(file_name, class_name):
-    data = open_csv(file_name)
-    rows = data[1:]
+    """
+    Заменяет колонки внешних ключей на id-атрибуты модели.
+    Связанные объекты не загружаются из базы.
+    """
+    return {
+        KEY_FIELDS[field_key][0] if field_key in KEY_FIELDS else field_key:
+            field_value
+        for field_key, field_value in data_csv.items()
+    }
+
+
+def convert_rows(rows, class_name):
+    """Превращает строки csv-файла в несохранённые объекты модели."""
     for row in rows:
-        data_csv = dict(zip(data[0], row))
-        data_csv = change_fk_values(data_csv)
-        try:
-            table = class_name(**data_csv)
-            table.save()
-        except (ValueError, IntegrityError) as error:
-            print(f'Ошибка в загружаемых данных. {error}. '
-                  f'Таблица {class_name.__qualname__} не загружена.')
+        yield class_name(**change_fk_values(row))
+
+
+def batched(objects, batch_size):
+    """Разбивает поток объектов на списки не длиннее batch_size."""
+    iterator = iter(objects)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def reset_sequences(class_name):
+    """Сдвигает последовательность первичных ключей после вставки с id."""
+    sql_list = connection.ops.sequence_reset_sql(no_style(), [class_name])
+    with connection.cursor() as cursor:
+        for sql in sql_list:
+            cursor.execute(sql)
+
+
+def save_batch(class_name, batch, update_fields=None):
+    """
+    Сохраняет пачку объектов.
+    Если переданы update_fields, уже существующие по pk строки
+    обновляются, а остальные вставляются.
+    """
+    if update_fields is None:
+        class_name.objects.bulk_create(batch)
+        return
+    for obj in batch:
+        obj.pk = class_name._meta.pk.to_python(obj.pk)
+    existing = set(class_name.objects.filter(
+        pk__in=[obj.pk for obj in batch]
+    ).values_list('pk', flat=True))
+    class_name.objects.bulk_create(
+        [obj for obj in batch if obj.pk not in existing]
+    )
+    if update_fields:
+        class_name.objects.bulk_update(
+            [obj for obj in batch if obj.pk in existing], update_fields
+        )
+
+
+def get_update_fields(file_name):
+    return [
+        field for field in change_fk_values(dict.fromkeys(
+            read_header(file_name)
+        ))
+        if field != 'id'
+    ]
+
+
+def import_csv(file_name, class_name, batch_size=BATCH_SIZE,
+               resume=False, upsert=False):
+    """
+    Загружает csv-файл пачками, отмечая после каждой пачки
+    количество загруженных строк в той же транзакции.
+    С resume загрузка продолжается с последней отметки.
+    """
+    table_name = class_name.__qualname__
+    checkpoint, _ = ImportCheckpoint.objects.get_or_create(
+        file_name=file_name
+    )
+    if not resume:
+        checkpoint.offset, checkpoint.completed = 0, False
+        checkpoint.save()
+    elif checkpoint.completed:
+        print(f'Таблица {table_name} уже импортирована.')
+        return True
+    update_fields = get_update_fields(file_name) if upsert else None
+    rows_count = 0
+    started = time.monotonic()
+    try:
+        rows = islice(open_csv(file_name), checkpoint.offset, None)
+        for batch in batched(convert_rows(rows, class_name), batch_size):
+            with transaction.atomic():
+                save_batch(class_name, batch, update_fields)
+                checkpoint.offset += len(batch)
+                checkpoint.save(update_fields=('offset',))
+            rows_count += len(batch)
+        with transaction.atomic():
+            reset_sequences(class_name)
+            checkpoint.completed = True
+            checkpoint.save(update_fields=('completed',))
+    except FileNotFoundError:
+        print(f'Файл {file_name}.csv не найден.')
+        return True
+    except (ValueError, ValidationError, IntegrityError) as error:
+        print(f'Ошибка в загружаемых данных после строки '
+              f'{checkpoint.offset}. {error}. '
+              f'Таблица {table_name} загружена не полностью, '
+              f'продолжить загрузку можно с флагом --resume.')
+        return False
+    elapsed = time.monotonic() - started
+    print(f'Таблица {table_name} импортирована: '
+          f'{rows_count} строк за {elapsed:.2f} с '
+          f'({rows_count / max(elapsed, 1e-6):.0f} строк/с).')
+    return True
+
+
+def import_table(file_name, **options):
+    print(f'Импортирование таблицы {FILES_CLASSES[file_name].__qualname__}')
+    return import_csv(file_name, FILES_CLASSES[file_name], **options)
+
+
+class SerialExecutor(Executor):
+    """Исполнитель, выполняющий задачи сразу в текущем процессе."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+def schedule_import(dependencies, executor, **options):
+    """
+    Загружает таблицы по мере готовности их родительских таблиц.
+    Независимые таблицы выполняются исполнителем одновременно,
+    таблицы с незагруженными родителями пропускаются.
+    """
+    pending = dict(dependencies)
+    done, failed, running = set(), set(), {}
+    while pending or running:
+        for file_name, parents in list(pending.items()):
+            if parents & failed:
+                missing = ', '.join(sorted(parents & failed))
+                print(f'Таблица {FILES_CLASSES[file_name].__qualname__} '
+                      f'пропущена: не загружены {missing}.')
+                failed.add(file_name)
+                del pending[file_name]
+            elif parents <= done:
+                future = executor.submit(import_table, file_name, **options)
+                running[future] = file_name
+                del pending[file_name]
+        if not running:
             break
-    print(f'Таблица {class_name.__qualname__} импортирована.')
+        finished, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in finished:
+            file_name = running.pop(future)
+            (done if future.result() else failed).add(file_name)
+    return done
 
 
 class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=positive_int,
+            default=BATCH_SIZE,
+            help='Количество строк, вставляемых одним запросом.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help=('Количество процессов для одновременной загрузки '
+                  'независимых таблиц. SQLite всегда загружается '
+                  'в одном процессе.')
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить загрузку с последней сохранённой отметки.'
+        )
+        parser.add_argument(
+            '--upsert',
+            action='store_true',
+            help='Обновлять строки с уже существующим первичным ключом.'
+        )
+
+    def get_executor(self, workers):
+        if workers <= 1 or connection.vendor == 'sqlite':
+            return SerialExecutor()
+        # Каждый процесс должен открыть собственное соединение с БД.
+        connections.close_all()
+        return ProcessPoolExecutor(
+            max_workers=workers, initializer=django.setup
+        )
+
     def handle(self, *args, **options):
-        for key, value in FILES_CLASSES.items():
-            print(f'Импортирование таблицы {value.__qualname__}')
-            import_csv(key, value)
+        with self.get_executor(options['workers']) as executor:
+            schedule_import(
+                build_dependencies(),
+                executor,
+                batch_size=options['batch_size'],
+                resume=options['resume'],
+                upsert=options['upsert']
+            )
+        rebuild_ratings()
+        rebuild_search_index()
+        rebuild_user_search_index()
+        ResourceVersion.bump(ResourceVersion.GLOBAL)
+        print('Рейтинги произведений пересчитаны.')
@@ -0,0 +1,66 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from reviews.models import ResourceVersion, Review, Title, TitleStats
+
+
+def rebuild_ratings():
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    with transaction.atomic():
+        ResourceVersion.bump('titles')
+        TitleStats.rebuild()
+        return Title.objects.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('id')).values('total')),
+                0
+            )
+        )
+
+
+def find_mismatches():
+    titles = Title.objects.annotate(
+        live_rating=Avg('reviews__score')
+    ).order_by().values_list('id', 'rating_sum', 'rating_count',
+                             'live_rating')
+    mismatches = []
+    for title_id, rating_sum, rating_count, live_rating in titles.iterator():
+        stored_rating = rating_sum / rating_count if rating_count else None
+        if (
+            (stored_rating is None) != (live_rating is None)
+            or stored_rating is not None
+            and abs(stored_rating - live_rating) > 1e-9
+        ):
+            mismatches.append(title_id)
+    return mismatches
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает сохранённые рейтинги и статистику отзывов '
+            'произведений и сверяет рейтинги со средней оценкой отзывов.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только сверить рейтинги, не пересчитывая их.'
+        )
+
+    def handle(self, *args, **options):
+        if not options['check']:
+            count = rebuild_ratings()
+            print(f'Рейтинги пересчитаны для {count} произведений.')
+        mismatches = find_mismatches()
+        if mismatches:
+            raise CommandError(
+                f'Рейтинги не совпадают для произведений: '
+                f'{", ".join(map(str, mismatches))}.'
+            )
+        print('Сохранённые рейтинги совпадают со средней оценкой отзывов.')
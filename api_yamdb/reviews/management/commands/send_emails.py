@@ -0,0 +1,115 @@
+import smtplib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from reviews.management.commands.import_csv import positive_int
+from reviews.models import OutgoingEmail
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+
+
+def get_pending_emails(batch_size, max_attempts):
+    emails = OutgoingEmail.objects.filter(
+        sent__isnull=True,
+        attempts__lt=max_attempts,
+        send_after__lte=timezone.now()
+    )
+    if connection.features.has_select_for_update_skip_locked:
+        emails = emails.select_for_update(skip_locked=True)
+    return list(emails[:batch_size])
+
+
+def postpone(email, error):
+    """Откладывает письмо с экспоненциально растущей задержкой."""
+    email.last_error = str(error)
+    email.send_after = timezone.now() + timedelta(
+        seconds=settings.EMAIL_RETRY_DELAY * 2 ** (email.attempts - 1)
+    )
+
+
+def send_batch(batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS):
+    """
+    Отправляет пачку ожидающих писем через одно соединение
+    с почтовым сервером. Неотправленные письма откладываются
+    с экспоненциально растущей задержкой; если не удалось
+    соединиться с сервером, откладывается вся пачка.
+    Возвращает количество отправленных и неотправленных писем.
+    """
+    sent = failed = 0
+    with transaction.atomic():
+        emails = get_pending_emails(batch_size, max_attempts)
+        if not emails:
+            return sent, failed
+        mail_connection = get_connection()
+        try:
+            mail_connection.open()
+        except (smtplib.SMTPException, OSError) as error:
+            for email in emails:
+                email.attempts += 1
+                postpone(email, error)
+            failed = len(emails)
+        else:
+            with mail_connection:
+                for email in emails:
+                    email.attempts += 1
+                    try:
+                        mail_connection.send_messages([EmailMessage(
+                            email.subject,
+                            email.message,
+                            email.from_email,
+                            [email.recipient]
+                        )])
+                    except (smtplib.SMTPException, OSError) as error:
+                        postpone(email, error)
+                        failed += 1
+                    else:
+                        email.sent = timezone.now()
+                        sent += 1
+        OutgoingEmail.objects.bulk_update(
+            emails, ('attempts', 'last_error', 'send_after', 'sent')
+        )
+    return sent, failed
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих писем.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=positive_int,
+            default=BATCH_SIZE,
+            help='Количество писем, отправляемых за одно соединение.'
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=positive_int,
+            default=MAX_ATTEMPTS,
+            help='Количество попыток отправки одного письма.'
+        )
+        parser.add_argument(
+            '--loop',
+            type=float,
+            metavar='SECONDS',
+            help='Проверять очередь непрерывно с указанным интервалом.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_batch(
+                options['batch_size'], options['max_attempts']
+            )
+            if sent or failed:
+                print(f'Отправлено писем: {sent}, с ошибкой: {failed}.')
+            if sent + failed == options['batch_size']:
+                continue
+            if options['loop'] is None:
+                break
+            time.sleep(options['loop'])
@@ -0,0 +1,26 @@
+# Generated by Django 3.2 on 2026-10-18 02:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0019_title_rating_sum_rating_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(max_length=256, unique=True, verbose_name='файл')),
+                ('offset', models.PositiveIntegerField(default=0, verbose_name='загружено строк')),
+                ('completed', models.BooleanField(default=False, verbose_name='загрузка завершена')),
+            ],
+            options={
+                'verbose_name': 'Отметка импорта',
+                'verbose_name_plural': 'Отметки импорта',
+            },
+        ),
+    ]
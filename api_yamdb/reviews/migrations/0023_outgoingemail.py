@@ -0,0 +1,34 @@
+# Generated by Django 3.2 on 2026-10-18 03:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0022_resourceversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=256, verbose_name='тема')),
+                ('message', models.TextField(verbose_name='текст')),
+                ('from_email', models.EmailField(max_length=254, verbose_name='отправитель')),
+                ('recipient', models.EmailField(max_length=254, verbose_name='получатель')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='дата создания')),
+                ('send_after', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='отправить после')),
+                ('sent', models.DateTimeField(blank=True, null=True, verbose_name='дата отправки')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='попыток отправки')),
+                ('last_error', models.TextField(blank=True, verbose_name='последняя ошибка')),
+            ],
+            options={
+                'verbose_name': 'Исходящее письмо',
+                'verbose_name_plural': 'Исходящие письма',
+                'ordering': ('send_after',),
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2 on 2026-10-18 03:20
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE reviews_title_search '
+            'USING fts5(name, description)'
+        )
+        schema_editor.execute(
+            'INSERT INTO reviews_title_search (rowid, name, description) '
+            "SELECT id, name, coalesce(description, '') FROM reviews_title"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX reviews_title_search_idx ON reviews_title '
+            "USING gin (to_tsvector('russian', "
+            "name || ' ' || coalesce(description, '')))"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE reviews_title_search')
+    elif vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX reviews_title_search_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0024_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
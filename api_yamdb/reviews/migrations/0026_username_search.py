@@ -0,0 +1,51 @@
+# Generated by Django 3.2 on 2026-10-18 03:45
+
+from django.db import migrations
+
+
+def has_trigram_tokenizer(connection):
+    return connection.Database.sqlite_version_info >= (3, 34, 0)
+
+
+def create_username_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE INDEX reviews_user_username_ci_idx '
+            'ON reviews_user (username COLLATE NOCASE)'
+        )
+        if has_trigram_tokenizer(connection):
+            schema_editor.execute(
+                'CREATE VIRTUAL TABLE reviews_user_search '
+                "USING fts5(username, tokenize='trigram')"
+            )
+            schema_editor.execute(
+                'INSERT INTO reviews_user_search (rowid, username) '
+                'SELECT id, username FROM reviews_user'
+            )
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            'CREATE INDEX reviews_user_username_trgm_idx ON reviews_user '
+            'USING gin (UPPER(username::text) gin_trgm_ops)'
+        )
+
+
+def drop_username_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute('DROP INDEX reviews_user_username_ci_idx')
+        schema_editor.execute('DROP TABLE IF EXISTS reviews_user_search')
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX reviews_user_username_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0025_title_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_username_indexes, drop_username_indexes),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 3.2 on 2026-10-18 03:37
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+import django.db.models.deletion
+
+
+def fill_title_stats(apps, schema_editor):
+    TitleStats = apps.get_model('reviews', 'TitleStats')
+    Title = apps.get_model('reviews', 'Title')
+    rows = Title.objects.order_by().values('pk').annotate(
+        review_count=Count('reviews'),
+        latest_review=Max('reviews__pub_date'),
+        **{
+            f'score_{score}': Count(
+                'reviews', filter=Q(reviews__score=score)
+            )
+            for score in range(1, 11)
+        }
+    )
+    TitleStats.objects.bulk_create(
+        (TitleStats(title_id=row.pop('pk'), **row) for row in rows),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0026_username_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleStats',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='количество отзывов')),
+                ('latest_review', models.DateTimeField(blank=True, null=True, verbose_name='дата последнего отзыва')),
+                ('score_1', models.PositiveIntegerField(default=0, verbose_name='оценок 1')),
+                ('score_2', models.PositiveIntegerField(default=0, verbose_name='оценок 2')),
+                ('score_3', models.PositiveIntegerField(default=0, verbose_name='оценок 3')),
+                ('score_4', models.PositiveIntegerField(default=0, verbose_name='оценок 4')),
+                ('score_5', models.PositiveIntegerField(default=0, verbose_name='оценок 5')),
+                ('score_6', models.PositiveIntegerField(default=0, verbose_name='оценок 6')),
+                ('score_7', models.PositiveIntegerField(default=0, verbose_name='оценок 7')),
+                ('score_8', models.PositiveIntegerField(default=0, verbose_name='оценок 8')),
+                ('score_9', models.PositiveIntegerField(default=0, verbose_name='оценок 9')),
+                ('score_10', models.PositiveIntegerField(default=0, verbose_name='оценок 10')),
+            ],
+            options={
+                'verbose_name': 'Статистика отзывов',
+                'verbose_name_plural': 'Статистика отзывов',
+            },
+        ),
+        migrations.RunPython(fill_title_stats, migrations.RunPython.noop),
+    ]
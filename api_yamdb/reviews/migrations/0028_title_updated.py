@@ -0,0 +1,19 @@
+# Generated by Django 3.2 on 2026-10-18 03:51
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0027_titlestats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='updated',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='дата изменения рейтинга'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 04:08
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0028_title_updated'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='title',
+            name='updated',
+        ),
+    ]
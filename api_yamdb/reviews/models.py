@@ -1,7 +1,10 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import Count, F, Max, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 
 from .validators import validate_year, validate_username
 from .constans import (
@@ -9,7 +12,8 @@ from .constans import (
     MIN_SCORE,
     MAX_SCORE,
     SLICE_NAME_OBJECT,
-    EMAIL_LENGTH
+    EMAIL_LENGTH,
+    RATING_VERSION_SHARDS
 )
 
 
@@ -47,12 +51,23 @@ class User(AbstractUser):
         choices=Role.choices,
         default=Role.USER,
     )
+    token_version = models.PositiveIntegerField(
+        verbose_name='версия токенов',
+        default=0
+    )
 
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
         ordering = ('username',)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженное имя, чтобы заметить его изменение."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_username = instance.__dict__.get('username')
+        return instance
+
     @property
     def is_admin(self):
         return self.role == self.Role.ADMIN or self.is_staff
@@ -130,13 +145,58 @@ class Title(models.Model):
         null=True,
         related_name='titles'
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='сумма оценок',
+        default=0
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='количество оценок',
+        default=0
+    )
 
     class Meta:
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=('name',), name='title_name_idx'),
+            models.Index(fields=('year',), name='title_year_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @classmethod
+    def change_rating(cls, title_id, score_delta, count_delta=0):
+        """
+        Изменяет сохранённые сумму и количество оценок произведения.
+        Обновление выполняется одним UPDATE без чтения строки.
+        """
+        cls.objects.filter(pk=title_id).update(
+            rating_sum=F('rating_sum') + score_delta,
+            rating_count=F('rating_count') + count_delta
+        )
+
+    @classmethod
+    def rating_version_name(cls, title_id):
+        """
+        Счётчик изменений рейтинга, общий для группы произведений.
+        Отзывы на разные произведения увеличивают разные счётчики
+        и не ждут блокировки одной строки.
+        """
+        return f'ratings:{int(title_id) % RATING_VERSION_SHARDS}'
+
+    @classmethod
+    def rating_version_names(cls):
+        return tuple(
+            cls.rating_version_name(shard)
+            for shard in range(RATING_VERSION_SHARDS)
+        )
+
 
 class BaseTextDateAuthorModel(models.Model):
     """Базовый класс для моделей отзывов и комментариев."""
@@ -182,6 +242,16 @@ class Review(BaseTextDateAuthorModel):
                 name='unique_author_title'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=('title', '-pub_date'),
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=('title', 'score'),
+                name='review_title_score_idx'
+            ),
+        ]
 
 
 class Comment(BaseTextDateAuthorModel):
@@ -196,3 +266,267 @@ class Comment(BaseTextDateAuthorModel):
     class Meta(BaseTextDateAuthorModel.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=('review', '-pub_date'),
+                name='comment_review_pub_date_idx'
+            ),
+        ]
+
+
+class TitleStats(models.Model):
+    """
+    Модель для заранее посчитанной статистики отзывов произведения.
+    Число оценок каждого значения хранится в полях score_<оценка>.
+    Строка создаётся вместе с произведением и обновляется при каждом
+    изменении отзывов без пересчёта по таблице отзывов.
+    """
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Произведение'
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='количество отзывов',
+        default=0
+    )
+    latest_review = models.DateTimeField(
+        verbose_name='дата последнего отзыва',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Статистика отзывов'
+        verbose_name_plural = 'Статистика отзывов'
+
+    def __str__(self):
+        return f'{self.title_id}: {self.review_count}'
+
+    @staticmethod
+    def score_field(score):
+        return f'score_{score}'
+
+    @property
+    def scores(self):
+        return {
+            score: getattr(self, self.score_field(score))
+            for score in range(MIN_SCORE, MAX_SCORE + 1)
+        }
+
+    @property
+    def rating(self):
+        if not self.review_count:
+            return None
+        return sum(
+            score * count for score, count in self.scores.items()
+        ) / self.review_count
+
+    @classmethod
+    def calculate(cls, title_ids=None, using=None):
+        """
+        Считает статистику по таблице отзывов, не сохраняя её,
+        для перечисленных произведений или для всех.
+        """
+        titles = Title.objects.using(using).order_by()
+        if title_ids is not None:
+            titles = titles.filter(pk__in=title_ids)
+        rows = titles.values('pk').annotate(
+            review_count=Count('reviews'),
+            latest_review=Max('reviews__pub_date'),
+            **{
+                cls.score_field(score): Count(
+                    'reviews', filter=Q(reviews__score=score)
+                )
+                for score in range(MIN_SCORE, MAX_SCORE + 1)
+            }
+        )
+        return (cls(title_id=row.pop('pk'), **row) for row in rows)
+
+    @classmethod
+    def rebuild(cls, title_ids=None):
+        """
+        Пересчитывает и сохраняет статистику перечисленных
+        произведений или всех, если title_ids не передан.
+        Отзывы читаются из основной базы.
+        """
+        using = router.db_for_write(cls)
+        stats = cls.objects.using(using).all()
+        if title_ids is not None:
+            stats = stats.filter(title__in=title_ids)
+        with transaction.atomic(using=using):
+            stats.delete()
+            cls.objects.using(using).bulk_create(
+                cls.calculate(title_ids, using=using),
+                batch_size=1000,
+                ignore_conflicts=True
+            )
+
+    @classmethod
+    def change(cls, title_id, **changes):
+        if not cls.objects.filter(title_id=title_id).update(**changes):
+            cls.rebuild([title_id])
+
+    @classmethod
+    def add_review(cls, review):
+        field = cls.score_field(review.score)
+        cls.change(
+            review.title_id,
+            review_count=F('review_count') + 1,
+            latest_review=Greatest(
+                Coalesce('latest_review', review.pub_date), review.pub_date
+            ),
+            **{field: F(field) + 1}
+        )
+
+    @classmethod
+    def change_score(cls, title_id, old_score, new_score):
+        if old_score == new_score:
+            return
+        old_field = cls.score_field(old_score)
+        new_field = cls.score_field(new_score)
+        cls.change(
+            title_id,
+            **{old_field: F(old_field) - 1, new_field: F(new_field) + 1}
+        )
+
+    @classmethod
+    def remove_review(cls, review):
+        """
+        Вызывается после удаления отзыва из базы.
+        Отсутствующая строка не пересчитывается: при удалении
+        произведения она удаляется каскадом вместе с отзывами.
+        """
+        field = cls.score_field(review.score)
+        cls.objects.filter(title_id=review.title_id).update(
+            review_count=F('review_count') - 1,
+            latest_review=Subquery(
+                Review.objects.filter(
+                    title_id=review.title_id
+                ).order_by('-pub_date').values('pub_date')[:1]
+            ),
+            **{field: F(field) - 1}
+        )
+
+
+for score in range(MIN_SCORE, MAX_SCORE + 1):
+    TitleStats.add_to_class(
+        TitleStats.score_field(score),
+        models.PositiveIntegerField(
+            verbose_name=f'оценок {score}',
+            default=0
+        )
+    )
+
+
+class ImportCheckpoint(models.Model):
+    """Модель для отметки загруженных строк csv-файла."""
+    file_name = models.CharField(
+        verbose_name='файл',
+        max_length=256,
+        unique=True
+    )
+    offset = models.PositiveIntegerField(
+        verbose_name='загружено строк',
+        default=0
+    )
+    completed = models.BooleanField(
+        verbose_name='загрузка завершена',
+        default=False
+    )
+
+    class Meta:
+        verbose_name = 'Отметка импорта'
+        verbose_name_plural = 'Отметки импорта'
+
+    def __str__(self):
+        return f'{self.file_name}: {self.offset}'
+
+
+class ResourceVersion(models.Model):
+    """Модель для счётчика изменений набора данных API."""
+    GLOBAL = 'global'
+
+    name = models.CharField(
+        verbose_name='набор данных',
+        max_length=64,
+        unique=True
+    )
+    version = models.PositiveIntegerField(
+        verbose_name='версия',
+        default=0
+    )
+    updated = models.DateTimeField(
+        verbose_name='дата изменения',
+        null=True
+    )
+
+    class Meta:
+        verbose_name = 'Версия данных'
+        verbose_name_plural = 'Версии данных'
+
+    def __str__(self):
+        return f'{self.name}: {self.version}'
+
+    @classmethod
+    def bump(cls, *names):
+        """Увеличивает версии перечисленных наборов данных."""
+        now = timezone.now()
+        for name in names:
+            changes = dict(version=F('version') + 1, updated=now)
+            if cls.objects.filter(name=name).update(**changes):
+                continue
+            _, created = cls.objects.get_or_create(
+                name=name, defaults=dict(version=1, updated=now)
+            )
+            if not created:
+                cls.objects.filter(name=name).update(**changes)
+
+
+class OutgoingEmail(models.Model):
+    """Модель для письма, ожидающего отправки."""
+    subject = models.CharField(
+        verbose_name='тема',
+        max_length=256
+    )
+    message = models.TextField(verbose_name='текст')
+    from_email = models.EmailField(
+        verbose_name='отправитель',
+        max_length=EMAIL_LENGTH
+    )
+    recipient = models.EmailField(
+        verbose_name='получатель',
+        max_length=EMAIL_LENGTH
+    )
+    created = models.DateTimeField(
+        verbose_name='дата создания',
+        auto_now_add=True
+    )
+    send_after = models.DateTimeField(
+        verbose_name='отправить после',
+        default=timezone.now,
+        db_index=True
+    )
+    sent = models.DateTimeField(
+        verbose_name='дата отправки',
+        null=True,
+        blank=True
+    )
+    attempts = models.PositiveIntegerField(
+        verbose_name='попыток отправки',
+        default=0
+    )
+    last_error = models.TextField(
+        verbose_name='последняя ошибка',
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('send_after',)
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,168 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = 'reviews_title_search'
+SEARCH_CONFIG = 'russian'
+POSTGRESQL_DOCUMENT = (
+    f"to_tsvector('{SEARCH_CONFIG}', "
+    "reviews_title.name || ' ' || coalesce(reviews_title.description, ''))"
+)
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def uses_search_table():
+    """
+    На SQLite поиск идёт по отдельной таблице FTS5,
+    которую нужно обновлять вместе с произведениями.
+    На PostgreSQL индекс строится по выражению и обновляется сам.
+    """
+    return connection.vendor == 'sqlite'
+
+
+def index_title(title):
+    if not uses_search_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [title.pk]
+        )
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            [title.pk, title.name, title.description or '']
+        )
+
+
+def unindex_title(title_id):
+    if not uses_search_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [title_id]
+        )
+
+
+def rebuild_search_index():
+    """Заново заполняет поисковую таблицу по всем произведениям."""
+    if not uses_search_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, name, description) '
+            "SELECT id, name, coalesce(description, '') FROM reviews_title"
+        )
+
+
+def search_titles(queryset, query):
+    """
+    Оставляет произведения, в названии или описании которых
+    встречаются все слова запроса, и сортирует их по релевантности.
+    """
+    words = WORD_PATTERN.findall(query)
+    if not words:
+        return queryset.none()
+    if uses_search_table():
+        # Без стемминга FTS5 находит формы слова по общему началу.
+        match = ' '.join(f'"{word}"*' for word in words)
+        # Соединение с поисковой таблицей вместо подзапроса на каждую
+        # строку: ранг bm25 вычисляется за один проход по совпадениям.
+        return queryset.extra(
+            select={'search_rank': f'{SEARCH_TABLE}.rank'},
+            tables=[SEARCH_TABLE],
+            where=[
+                f'{SEARCH_TABLE} MATCH %s',
+                f'{SEARCH_TABLE}.rowid = reviews_title.id'
+            ],
+            params=[match]
+        ).order_by('search_rank', 'id')
+    search_query = ' '.join(words)
+    return queryset.filter(
+        RawSQL(
+            f"{POSTGRESQL_DOCUMENT} @@ "
+            f"plainto_tsquery('{SEARCH_CONFIG}', %s)",
+            [search_query],
+            output_field=BooleanField()
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            f"ts_rank({POSTGRESQL_DOCUMENT}, "
+            f"plainto_tsquery('{SEARCH_CONFIG}', %s))",
+            [search_query],
+            output_field=FloatField()
+        )
+    ).order_by('-search_rank', 'id')
+
+
+USER_SEARCH_TABLE = 'reviews_user_search'
+TRIGRAM_LENGTH = 3
+
+
+def uses_user_search_table():
+    """
+    Таблица FTS5 с триграммами для поиска подстроки в имени
+    создаётся только на SQLite, где есть токенизатор trigram.
+    На PostgreSQL этот поиск обслуживает индекс pg_trgm.
+    """
+    return (
+        uses_search_table()
+        and connection.Database.sqlite_version_info >= (3, 34, 0)
+    )
+
+
+def index_user(user):
+    if not uses_user_search_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {USER_SEARCH_TABLE} WHERE rowid = %s', [user.pk]
+        )
+        cursor.execute(
+            f'INSERT INTO {USER_SEARCH_TABLE} (rowid, username) '
+            'VALUES (%s, %s)',
+            [user.pk, user.username]
+        )
+
+
+def unindex_user(user_id):
+    if not uses_user_search_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {USER_SEARCH_TABLE} WHERE rowid = %s', [user_id]
+        )
+
+
+def rebuild_user_search_index():
+    """Заново заполняет таблицу поиска по именам пользователей."""
+    if not uses_user_search_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {USER_SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {USER_SEARCH_TABLE} (rowid, username) '
+            'SELECT id, username FROM reviews_user'
+        )
+
+
+def search_usernames(queryset, value, contains=False):
+    """
+    Ищет пользователей по началу имени без учёта регистра.
+    С contains=True ищет подстроку в любом месте имени: на SQLite
+    по таблице триграмм, если в запросе не меньше трёх символов.
+    """
+    if not contains:
+        return queryset.filter(username__istartswith=value)
+    if uses_user_search_table() and len(value) >= TRIGRAM_LENGTH:
+        phrase = value.replace('"', '""')
+        return queryset.filter(
+            id__in=RawSQL(
+                f'SELECT rowid FROM {USER_SEARCH_TABLE} '
+                f'WHERE {USER_SEARCH_TABLE} MATCH %s',
+                [f'"{phrase}"']
+            )
+        )
+    return queryset.filter(username__icontains=value)
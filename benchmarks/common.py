@@ -0,0 +1,47 @@
+"""Общие функции для скриптов замеров производительности."""
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+
+
+def setup_django(db_name, **overrides):
+    """
+    Настраивает Django на отдельную базу SQLite и применяет миграции.
+    Остальные настройки берутся из api_yamdb.settings, overrides
+    заменяют их (в том числе DATABASES).
+    """
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+
+    from api_yamdb import settings as project_settings
+
+    values = {
+        name: getattr(project_settings, name)
+        for name in dir(project_settings) if name.isupper()
+    }
+    values['DATABASES'] = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': str(db_name),
+        }
+    }
+    values.update(overrides)
+    settings.configure(**values)
+    django.setup()
+    call_command('migrate', verbosity=0)
+
+
+def measure(func, repeat=20):
+    """Возвращает лучшее время выполнения func в миллисекундах."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
@@ -0,0 +1,98 @@
+"""
+Замер количества запросов в секунду к /api/v1/titles/
+с закрытием соединения с БД после каждого запроса
+(CONN_MAX_AGE=0) и с повторным использованием соединения.
+Каждый режим запускается в отдельном процессе.
+
+    python benchmarks/connections.py --requests 2000
+    python benchmarks/connections.py --database-url postgres://...
+
+Базу из --database-url скрипт мигрирует и заполняет данными,
+поэтому она должна быть пустой и отдельной от рабочей.
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from wsgiref.util import setup_testing_defaults
+
+from common import PROJECT_DIR, setup_django
+
+MODES = {'close': 0, 'reuse': 600}
+
+
+def seed(titles_count):
+    from reviews.models import Categorie, Title
+
+    category = Categorie.objects.create(name='Фильм', slug='movie')
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000, category=category)
+        for idx in range(titles_count)
+    )
+
+
+def get_titles(application):
+    environ = {'PATH_INFO': '/api/v1/titles/'}
+    setup_testing_defaults(environ)
+    statuses = []
+    response = application(
+        environ, lambda status, headers: statuses.append(status)
+    )
+    b''.join(response)
+    response.close()
+    assert statuses == ['200 OK'], statuses
+
+
+def run_mode(mode, args, directory):
+    sys.path.insert(0, str(PROJECT_DIR))
+    from api_yamdb.database import parse_database_url
+
+    db_name = directory / 'bench.sqlite3'
+    setup_django(
+        db_name,
+        DATABASES={'default': parse_database_url(
+            args.database_url or f'sqlite:///{db_name}',
+            conn_max_age=MODES[mode],
+            conn_health_checks=True
+        )}
+    )
+    from django.core.wsgi import get_wsgi_application
+
+    seed(args.titles)
+    # Запросы идут через WSGI-обработчик, а не тестовый клиент:
+    # тестовый клиент не закрывает соединения после запроса.
+    application = get_wsgi_application()
+    get_titles(application)
+    started = time.perf_counter()
+    for _ in range(args.requests):
+        get_titles(application)
+    elapsed = time.perf_counter() - started
+    print(f'{mode} (CONN_MAX_AGE={MODES[mode]}): '
+          f'{args.requests / elapsed:.0f} запросов/с')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--titles', type=int, default=10)
+    parser.add_argument('--database-url')
+    parser.add_argument('--mode', choices=tuple(MODES))
+    args = parser.parse_args()
+
+    if args.mode:
+        with tempfile.TemporaryDirectory() as directory:
+            run_mode(args.mode, args, Path(directory))
+        return
+    for mode in MODES:
+        subprocess.run(
+            [sys.executable, __file__, *sys.argv[1:], '--mode', mode],
+            check=True
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Замер запросов фильтрации и выборки страниц до и после
+добавления индексов из миграции 0024_lookup_indexes.
+
+    python benchmarks/indexes.py --titles 10000 --reviews-per-title 20
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import measure, setup_django
+
+
+def seed(titles_count, users_count, reviews_per_title):
+    from reviews.models import Categorie, Comment, Review, Title, User
+
+    category = Categorie.objects.create(name='Фильм', slug='movie')
+    Title.objects.bulk_create(
+        (
+            Title(name=f'Произведение {idx:07}', year=1900 + idx % 120,
+                  category=category)
+            for idx in range(titles_count)
+        ),
+        batch_size=5000
+    )
+    User.objects.bulk_create(
+        (
+            User(username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+            for idx in range(users_count)
+        ),
+        batch_size=5000
+    )
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    user_ids = list(User.objects.values_list('id', flat=True))
+    Review.objects.bulk_create(
+        (
+            Review(title_id=title_id, text='Отзыв', score=1 + step % 10,
+                   author_id=user_ids[(number * reviews_per_title + step)
+                                      % users_count])
+            for number, title_id in enumerate(title_ids)
+            for step in range(reviews_per_title)
+        ),
+        batch_size=5000
+    )
+    Comment.objects.bulk_create(
+        (
+            Comment(review_id=review_id, text='Комментарий',
+                    author_id=user_ids[review_id % users_count])
+            for review_id in Review.objects.values_list('id', flat=True)
+        ),
+        batch_size=5000
+    )
+    # Популярное произведение: отзыв от каждого пользователя
+    # и комментарий каждого пользователя к одному отзыву.
+    popular = Title.objects.create(name='Популярное', year=2000,
+                                   category=category)
+    Review.objects.bulk_create(
+        (
+            Review(title=popular, text='Отзыв', score=1 + user_id % 10,
+                   author_id=user_id)
+            for user_id in user_ids
+        ),
+        batch_size=5000
+    )
+    review_id = Review.objects.filter(title=popular).values_list(
+        'id', flat=True
+    ).first()
+    Comment.objects.bulk_create(
+        (
+            Comment(review_id=review_id, text='Комментарий',
+                    author_id=user_id)
+            for user_id in user_ids
+        ),
+        batch_size=5000
+    )
+    return popular.id
+
+
+def get_queries(title_id):
+    from django.db.models import Avg
+
+    from reviews.models import Comment, Review, Title
+
+    review_id = Review.objects.filter(title_id=title_id).values_list(
+        'id', flat=True
+    ).first()
+    return {
+        'Title: year = ...': Title.objects.filter(year=1990)[:5],
+        'Title: order by name': Title.objects.order_by('name')[:5],
+        'Review: title, -pub_date': (
+            Review.objects.filter(title_id=title_id)
+            .order_by('-pub_date')[:5]
+        ),
+        'Comment: review, -pub_date': (
+            Comment.objects.filter(review_id=review_id)
+            .order_by('-pub_date')[:5]
+        ),
+        'Review: avg(score) by title': (
+            Review.objects.filter(title_id=title_id).order_by()
+            .values('title_id').annotate(rating=Avg('score'))
+        ),
+    }
+
+
+def run_queries(title_id):
+    results = {}
+    for name, queryset in get_queries(title_id).items():
+        results[name] = (
+            queryset.explain(),
+            measure(lambda: list(queryset.all()))
+        )
+    return results
+
+
+def drop_indexes():
+    from django.db import connection
+
+    from reviews.models import Comment, Review, Title
+
+    with connection.schema_editor() as editor:
+        for model in (Title, Review, Comment):
+            for index in model._meta.indexes:
+                editor.remove_index(model, index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--reviews-per-title', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(Path(directory) / 'bench.sqlite3')
+        title_id = seed(args.titles, args.users, args.reviews_per_title)
+        after = run_queries(title_id)
+        drop_indexes()
+        before = run_queries(title_id)
+
+    for name, (plan_after, time_after) in after.items():
+        plan_before, time_before = before[name]
+        print(f'{name}: без индексов {time_before:.3f} мс, '
+              f'с индексами {time_after:.3f} мс')
+        print(f'  план без индексов: {plan_before}')
+        print(f'  план с индексами:  {plan_after}')
+
+
+if __name__ == '__main__':
+    main()
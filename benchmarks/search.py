@@ -0,0 +1,94 @@
+"""
+Замер поиска произведений: полнотекстовый индекс
+против поиска подстроки в названии и описании.
+
+    python benchmarks/search.py --titles 100000 200000 400000
+"""
+import argparse
+import random
+import tempfile
+from pathlib import Path
+
+from common import measure, setup_django
+
+WORDS = (
+    'океан', 'планета', 'память', 'город', 'война', 'любовь', 'дорога',
+    'зеркало', 'зона', 'станция', 'детство', 'море', 'сад', 'музыка',
+    'поезд', 'зима', 'остров', 'письмо', 'солнце', 'лес'
+)
+RARE_WORD = 'солярис'
+RARE_EVERY = 1000
+QUERIES = (RARE_WORD, 'зеркало детство', 'солнце остров зима')
+
+
+def seed(titles_count, start):
+    from reviews.models import Title
+
+    generator = random.Random(start)
+    Title.objects.bulk_create(
+        (
+            Title(
+                name=f'Произведение {idx:07}',
+                year=1900 + idx % 120,
+                description=' '.join(
+                    generator.choices(WORDS, k=12)
+                    + [RARE_WORD] * (idx % RARE_EVERY == 0)
+                )
+            )
+            for idx in range(start, start + titles_count)
+        ),
+        batch_size=5000
+    )
+
+
+def fetch_page(queryset):
+    """Повторяет запросы страницы списка: количество и первые 10 строк."""
+    return queryset.count(), list(queryset[:10])
+
+
+def run_queries():
+    from django.db.models import Q
+
+    from reviews.models import Title
+    from reviews.search import search_titles
+
+    results = {}
+    for query in QUERIES:
+        condition = Q()
+        for word in query.split():
+            condition &= (
+                Q(name__icontains=word) | Q(description__icontains=word)
+            )
+        substring = Title.objects.filter(condition)
+        fulltext = search_titles(Title.objects.all(), query)
+        results[query] = (
+            measure(lambda: fetch_page(substring), repeat=5),
+            measure(lambda: fetch_page(fulltext), repeat=5)
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--titles', type=int, nargs='+', default=[20000, 40000, 80000]
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(Path(directory) / 'bench.sqlite3')
+        from reviews.search import rebuild_search_index
+
+        total = 0
+        for titles_count in sorted(args.titles):
+            seed(titles_count - total, total)
+            total = titles_count
+            rebuild_search_index()
+            print(f'Произведений: {total}')
+            for query, (substring, fulltext) in run_queries().items():
+                print(f'  «{query}»: подстрока {substring:.3f} мс, '
+                      f'полнотекстовый индекс {fulltext:.3f} мс')
+
+
+if __name__ == '__main__':
+    main()
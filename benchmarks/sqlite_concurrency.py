@@ -0,0 +1,130 @@
+"""
+Замер одновременных чтения и записи в SQLite без настройки
+соединения и с параметрами из SQLITE_PRAGMAS.
+Каждый профиль запускается в отдельном процессе со своей базой.
+
+    python benchmarks/sqlite_concurrency.py --readers 4 --writers 2
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import setup_django
+
+# Умолчания SQLite: журнал с удалением и полная синхронизация.
+BASELINE_PRAGMAS = {'journal_mode': 'delete', 'synchronous': 'full'}
+
+
+def seed(titles_count, users_count):
+    from reviews.models import Title, User
+
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000)
+        for idx in range(titles_count)
+    )
+    User.objects.bulk_create(
+        User(username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+        for idx in range(users_count)
+    )
+
+
+def write_reviews(worker, workers, deadline, counters):
+    from django.db import connection, transaction
+    from django.db.utils import OperationalError
+
+    from reviews.models import Review, Title, User
+
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    user_ids = list(User.objects.values_list('id', flat=True))[worker::workers]
+    pairs = ((title_id, user_id)
+             for user_id in user_ids for title_id in title_ids)
+    for title_id, user_id in pairs:
+        if time.perf_counter() > deadline:
+            break
+        try:
+            with transaction.atomic():
+                Review.objects.create(
+                    title_id=title_id, author_id=user_id,
+                    text='Отзыв', score=5
+                )
+        except OperationalError:
+            counters['errors'] += 1
+        else:
+            counters['writes'] += 1
+    connection.close()
+
+
+def read_titles(deadline, counters):
+    from django.db import connection
+    from django.db.utils import OperationalError
+
+    from reviews.models import Review, Title
+
+    while time.perf_counter() < deadline:
+        try:
+            list(Title.objects.order_by('-rating_count')[:10])
+            Review.objects.count()
+        except OperationalError:
+            counters['errors'] += 1
+        else:
+            counters['reads'] += 1
+    connection.close()
+
+
+def run_profile(profile, args):
+    with tempfile.TemporaryDirectory() as directory:
+        overrides = {}
+        if profile == 'baseline':
+            overrides['SQLITE_PRAGMAS'] = BASELINE_PRAGMAS
+        setup_django(Path(directory) / 'bench.sqlite3', **overrides)
+        from django.db import connection
+
+        seed(args.titles, args.users)
+        connection.close()
+        counters = {'reads': 0, 'writes': 0, 'errors': 0}
+        deadline = time.perf_counter() + args.seconds
+        threads = [
+            threading.Thread(
+                target=write_reviews,
+                args=(worker, args.writers, deadline, counters)
+            )
+            for worker in range(args.writers)
+        ] + [
+            threading.Thread(target=read_titles, args=(deadline, counters))
+            for _ in range(args.readers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    print(f'{profile}: чтений {counters["reads"] / args.seconds:.0f}/с, '
+          f'записей {counters["writes"] / args.seconds:.0f}/с, '
+          f'ошибок блокировки {counters["errors"]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--titles', type=int, default=100)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--profile', choices=('baseline', 'tuned'))
+    args = parser.parse_args()
+
+    if args.profile:
+        run_profile(args.profile, args)
+        return
+    for profile in ('baseline', 'tuned'):
+        subprocess.run(
+            [sys.executable, __file__, *sys.argv[1:], '--profile', profile],
+            check=True
+        )
+
+
+if __name__ == '__main__':
+    main()
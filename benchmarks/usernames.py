@@ -0,0 +1,63 @@
+"""
+Замер поиска пользователей по имени: ICONTAINS без индекса,
+поиск по началу имени с индексом COLLATE NOCASE и поиск
+подстроки по таблице триграмм.
+
+    python benchmarks/usernames.py --users 1000000
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import measure, setup_django
+
+QUERIES = ('user12345', 'USER99', 'ser7777')
+
+
+def seed(users_count):
+    from reviews.models import User
+    from reviews.search import rebuild_user_search_index
+
+    User.objects.bulk_create(
+        (
+            User(username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+            for idx in range(users_count)
+        ),
+        batch_size=5000
+    )
+    rebuild_user_search_index()
+
+
+def fetch_page(queryset):
+    """Повторяет запросы страницы списка: количество и первые 10 строк."""
+    return queryset.count(), list(queryset[:10])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(Path(directory) / 'bench.sqlite3')
+        from reviews.models import User
+        from reviews.search import search_usernames
+
+        seed(args.users)
+        users = User.objects.all()
+        for query in QUERIES:
+            modes = {
+                'icontains': users.filter(username__icontains=query),
+                'prefix': search_usernames(users, query),
+                'contains': search_usernames(users, query, contains=True),
+            }
+            print(f'«{query}»:')
+            for name, queryset in modes.items():
+                elapsed = measure(lambda: fetch_page(queryset), repeat=5)
+                print(f'  {name}: {elapsed:.3f} мс, '
+                      f'найдено {queryset.count()}')
+                print(f'    план: {queryset.explain()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+import pytest
+from django.db import IntegrityError, connection
+from rest_framework.test import APIRequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from api.permissions import IsAuthorOrIsAdminOrIsModeratorOrRead
+from reviews.models import (
+    Categorie, Comment, Genre, Review, Title, TitleStats, User
+)
+from tests.utils import create_reviews_in_db, create_titles_in_db
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08QueriesCount:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_titles_list_queries_do_not_grow(self, client):
+        create_titles_in_db(1)
+        single_title_queries = count_queries(client, self.TITLES_URL)
+        Title.objects.all().delete()
+        Categorie.objects.all().delete()
+        Genre.objects.all().delete()
+        create_titles_in_db(5)
+        full_page_queries = count_queries(client, self.TITLES_URL)
+        assert single_title_queries == full_page_queries, (
+            f'Проверьте, что количество запросов к БД при GET-запросе к '
+            f'`{self.TITLES_URL}` не зависит от количества произведений на '
+            'странице: категория и жанры должны загружаться заранее.'
+        )
+
+    def test_02_title_detail_queries(self, client):
+        create_titles_in_db(1)
+        title = Title.objects.get()
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        assert count_queries(client, url) <= 3, (
+            f'Проверьте, что GET-запрос к `{url}` загружает произведение, '
+            'его категорию и жанры не более чем за два запроса к БД '
+            '(и один запрос версии данных для ETag).'
+        )
+
+    def test_03_review_create_without_duplicate_check(self, user_client,
+                                                      user):
+        create_titles_in_db(1)
+        title = Title.objects.get()
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        data = {'text': 'Отзыв', 'score': 5}
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data)
+        assert response.status_code == 201
+        assert not any(
+            query['sql'].startswith('SELECT')
+            and 'FROM "reviews_review"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что POST-запрос к `{url}` не выполняет отдельный '
+            'запрос на проверку повторного отзыва.'
+        )
+        response = user_client.post(url, data=data)
+        assert response.status_code == 400
+        assert Review.objects.count() == 1
+        title.refresh_from_db()
+        assert title.rating_count == 1
+
+    def test_04_comments_list_queries(self, client, user):
+        create_titles_in_db(2)
+        title, other_title = Title.objects.all()
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        Comment.objects.create(review=review, author=user, text='Первый')
+        single_comment_queries = count_queries(client, url)
+        for idx in range(4):
+            author = User.objects.create(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            Comment.objects.create(review=review, author=author, text='Ещё')
+        assert count_queries(client, url) == single_comment_queries, (
+            f'Проверьте, что при GET-запросе к `{url}` авторы комментариев '
+            'загружаются вместе с комментариями.'
+        )
+        response = client.get(
+            f'/api/v1/titles/{other_title.id}/reviews/{review.id}/comments/'
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что комментарии отзыва недоступны по адресу '
+            'другого произведения.'
+        )
+
+    def test_05_reviews_page_queries_do_not_grow(self, client):
+        create_titles_in_db(1)
+        title = Title.objects.get()
+        url = f'/api/v1/titles/{title.id}/reviews/?limit=100'
+        create_reviews_in_db(title, [5] * 5)
+        small_page_queries = count_queries(client, url)
+        create_reviews_in_db(title, [5] * 95, start=5)
+        assert len(client.get(url).json()['results']) == 100
+        assert count_queries(client, url) == small_page_queries, (
+            f'Проверьте, что количество запросов при GET-запросе к `{url}` '
+            'не зависит от количества отзывов на странице: авторы должны '
+            'загружаться вместе с отзывами.'
+        )
+
+    def test_06_object_permission_without_queries(self, user, moderator):
+        create_titles_in_db(1)
+        Review.objects.create(
+            title=Title.objects.get(), author=user, text='Отзыв', score=5
+        )
+        review = Review.objects.get()
+        permission = IsAuthorOrIsAdminOrIsModeratorOrRead()
+        factory = APIRequestFactory()
+        with CaptureQueriesContext(connection) as context:
+            for method, request_user, expected in (
+                ('get', moderator, True),
+                ('patch', user, True),
+                ('delete', moderator, True),
+            ):
+                request = getattr(factory, method)('/')
+                request.user = request_user
+                assert permission.has_object_permission(
+                    request, None, review
+                ) is expected
+        assert not context.captured_queries, (
+            'Проверьте, что проверка прав на уровне объекта не загружает '
+            'автора объекта из базы данных.'
+        )
+
+    def test_07_review_create_other_integrity_error(self, user_client,
+                                                    monkeypatch):
+        create_titles_in_db(1)
+        title = Title.objects.get()
+
+        def broken_add_review(review):
+            raise IntegrityError('CHECK constraint failed')
+
+        monkeypatch.setattr(TitleStats, 'add_review', broken_add_review)
+        with pytest.raises(IntegrityError):
+            user_client.post(
+                f'/api/v1/titles/{title.id}/reviews/',
+                data={'text': 'Отзыв', 'score': 5}
+            )
+        assert not Review.objects.exists(), (
+            'Проверьте, что ошибка целостности, не связанная с повторным '
+            'отзывом, не выдаётся за повторный отзыв.'
+        )
@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, admin_client, admin,
+                                              user, user_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения обновляется при создании '
+            'отзыва.'
+        )
+
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[1]['id']
+        )
+        response = user_client.patch(url, data={'score': 9})
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(admin_client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения обновляется при изменении '
+            'оценки отзыва.'
+        )
+
+        response = user_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения обновляется при удалении '
+            'отзыва.'
+        )
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (5, 1)
+
+    def test_02_rebuild_ratings_command(self, admin_client, admin, user,
+                                        user_client):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        Review.objects.filter(author=user).update(score=1)
+        Title.objects.update(rating_sum=0, rating_count=0)
+
+        call_command('rebuild_ratings')
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (6, 2), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'сохранённые суммы и количество оценок.'
+        )
+        assert self.get_rating(admin_client, title_id) == 3
+
+    def test_03_rating_after_author_deleted(self, admin_client, admin, user,
+                                            user_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[1]['id']
+        )
+        response = user_client.patch(url, data={'score': 9})
+        assert response.status_code == HTTPStatus.OK
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (5, 1), (
+            'Проверьте, что при удалении пользователя его отзывы '
+            'вычитаются из сохранённого рейтинга произведения.'
+        )
+        assert self.get_rating(admin_client, title_id) == 5
+
+    def test_04_rating_follows_orm_writes(self, user, admin):
+        title = Title.objects.create(name='Сталкер', year=1979)
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=4
+        )
+        Review.objects.create(title=title, author=admin, text='Отзыв', score=6)
+        review.score = 10
+        review.save()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (16, 2), (
+            'Проверьте, что рейтинг произведения обновляется при создании '
+            'и изменении отзыва не только через API.'
+        )
+        user.delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (6, 1)
@@ -0,0 +1,148 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from reviews.management.commands import import_csv
+from reviews.management.commands.import_csv import (
+    build_dependencies, open_csv, schedule_import
+)
+from reviews.models import (
+    Categorie, Comment, ImportCheckpoint, Review, Title
+)
+
+
+def get_ancestors(dependencies, file_name):
+    result = set()
+    for parent in dependencies[file_name]:
+        result |= {parent} | get_ancestors(dependencies, parent)
+    return result
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10ImportCsv:
+
+    def test_01_import_csv(self):
+        call_command('import_csv', batch_size=7)
+        assert Title.objects.count() == 32, (
+            'Проверьте, что команда `import_csv` загружает произведения.'
+        )
+        assert Review.objects.count() == 72, (
+            'Проверьте, что команда `import_csv` загружает отзывы.'
+        )
+        assert Comment.objects.count() == 3, (
+            'Проверьте, что команда `import_csv` загружает комментарии.'
+        )
+        assert Title.genre.through.objects.count() == 42
+        title = Review.objects.first().title
+        assert title.rating_count == title.reviews.count(), (
+            'Проверьте, что после импорта пересчитываются рейтинги '
+            'произведений.'
+        )
+
+    def test_02_import_dependencies(self):
+        dependencies = build_dependencies()
+        assert dependencies['category'] == set()
+        assert dependencies['users'] == set()
+        assert dependencies['titles'] == {'category'}
+        assert dependencies['genre_title'] == {'titles', 'genre'}
+        assert dependencies['review'] == {'titles', 'users'}
+        assert dependencies['comments'] == {'review', 'users'}
+
+    def test_03_import_upsert_and_resume(self):
+        call_command('import_csv', batch_size=10)
+        Title.objects.filter(pk=1).update(name='Изменено')
+        call_command('import_csv', upsert=True)
+        assert Title.objects.count() == 32
+        assert Title.objects.get(pk=1).name != 'Изменено', (
+            'Проверьте, что с флагом `--upsert` существующие строки '
+            'обновляются данными из csv-файла.'
+        )
+
+        csv_ids = [row['id'] for row in open_csv('review')]
+        Review.objects.filter(pk__in=csv_ids[40:]).delete()
+        ImportCheckpoint.objects.filter(file_name='review').update(
+            offset=40, completed=False
+        )
+        call_command('import_csv', resume=True, batch_size=10)
+        assert Review.objects.count() == 72, (
+            'Проверьте, что с флагом `--resume` загрузка продолжается '
+            'с последней сохранённой отметки.'
+        )
+        assert ImportCheckpoint.objects.get(file_name='review').completed
+
+    @pytest.mark.parametrize('batch_size', ('0', '-5'))
+    def test_04_invalid_batch_size(self, batch_size):
+        with pytest.raises(CommandError):
+            call_command('import_csv', f'--batch-size={batch_size}')
+        assert not ImportCheckpoint.objects.exists(), (
+            'Проверьте, что команда `import_csv` отклоняет `--batch-size` '
+            'меньше единицы до начала загрузки.'
+        )
+
+    def test_05_upsert_bad_row(self, tmp_path, monkeypatch, capsys):
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\nabc,Книга,book\n',
+            encoding='utf-8'
+        )
+        monkeypatch.setattr(import_csv, 'local_csv_dir', str(tmp_path))
+        assert not import_csv.import_csv(
+            'category', Categorie, batch_size=1, upsert=True
+        ), (
+            'Проверьте, что при ошибке в данных с флагом `--upsert` '
+            'команда `import_csv` сообщает о неполной загрузке.'
+        )
+        assert '--resume' in capsys.readouterr().out
+        checkpoint = ImportCheckpoint.objects.get(file_name='category')
+        assert (checkpoint.offset, checkpoint.completed) == (1, False)
+        assert Categorie.objects.count() == 1
+
+    @pytest.mark.parametrize('broken', (None, 'users', 'titles'))
+    def test_06_schedule_import_concurrent(self, monkeypatch, broken):
+        dependencies = build_dependencies()
+        durations = {
+            'category': 0.05, 'genre': 0.01, 'users': 0.03, 'titles': 0.01,
+            'genre_title': 0.02, 'review': 0.01, 'comments': 0.01,
+        }
+        lock = threading.Lock()
+        started, finished, running = {}, {}, set()
+        max_running = 0
+
+        def fake_import_table(file_name, **options):
+            nonlocal max_running
+            with lock:
+                started[file_name] = set(finished)
+                running.add(file_name)
+                max_running = max(max_running, len(running))
+            time.sleep(durations[file_name])
+            with lock:
+                running.discard(file_name)
+                finished[file_name] = file_name != broken
+            return finished[file_name]
+
+        monkeypatch.setattr(import_csv, 'import_table', fake_import_table)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            done = schedule_import(dependencies, executor)
+
+        for file_name, finished_before in started.items():
+            assert dependencies[file_name] <= finished_before, (
+                'Проверьте, что таблица загружается только после '
+                f'завершения родительских таблиц: {file_name}.'
+            )
+        assert max_running > 1, (
+            'Проверьте, что независимые таблицы загружаются одновременно.'
+        )
+        skipped = set()
+        if broken:
+            skipped = {
+                file_name for file_name in dependencies
+                if broken in get_ancestors(dependencies, file_name)
+            }
+            assert skipped, 'У сломанной таблицы должны быть потомки.'
+        assert not skipped & set(started), (
+            'Проверьте, что таблицы, зависящие от незагруженной, '
+            'пропускаются.'
+        )
+        assert done == set(dependencies) - skipped - {broken}
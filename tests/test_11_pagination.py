@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+from tests.utils import create_reviews_in_db
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11Pagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_reviews_cursor_pagination(self, client):
+        title = Title.objects.create(name='Произведение', year=2000)
+        create_reviews_in_db(title, [5] * 7)
+        url = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+            + '?pagination=cursor&limit=3'
+        )
+        received = []
+        with CaptureQueriesContext(connection) as context:
+            while url:
+                response = client.get(url)
+                assert response.status_code == 200
+                data = response.json()
+                assert 'count' not in data, (
+                    'Проверьте, что курсорная пагинация не возвращает '
+                    'общее количество объектов.'
+                )
+                assert len(data['results']) <= 3
+                received.extend(review['id'] for review in data['results'])
+                url = data['next']
+        expected = list(
+            Review.objects.order_by('-pub_date', '-id').values_list(
+                'id', flat=True
+            )
+        )
+        assert received == expected, (
+            'Проверьте, что курсорная пагинация возвращает все отзывы '
+            'по одному разу в порядке убывания даты публикации.'
+        )
+        assert not any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ), 'Проверьте, что курсорная пагинация не выполняет COUNT-запрос.'
+
+    def test_02_reviews_default_pagination(self, client):
+        title = Title.objects.create(name='Произведение', year=2000)
+        create_reviews_in_db(title, [5] * 2)
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        )
+        assert response.json()['count'] == 2
+
+    def test_03_titles_count_free_pagination(self, client):
+        for idx in range(7):
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL + '?pagination=nocount')
+        data = response.json()
+        assert 'count' not in data
+        assert len(data['results']) == 5
+        assert data['next'] and data['previous'] is None
+        assert not any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что режим `nocount` не выполняет COUNT-запрос.'
+        )
+        data = client.get(data['next']).json()
+        assert len(data['results']) == 2
+        assert data['next'] is None and data['previous']
+
+    def test_04_titles_approximate_pagination(self, client):
+        for idx in range(7):
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+        url = self.TITLES_URL + '?pagination=approximate'
+        assert client.get(url).json()['count'] == 7
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(url).json()['count'] == 7
+        assert not any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что режим `approximate` кеширует количество '
+            'объектов.'
+        )
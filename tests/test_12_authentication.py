@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.authentication import get_snapshot_key
+
+
+def user_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'FROM "reviews_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12Authentication:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    USERS_ME_URL = '/api/v1/users/me/'
+
+    def test_01_cached_user_lookup(self, user_client):
+        user_client.get(self.CATEGORIES_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(self.CATEGORIES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert not user_queries(context), (
+            'Проверьте, что при повторных запросах с тем же токеном '
+            'пользователь не загружается из базы данных.'
+        )
+
+    def test_02_role_change_invalidates_cache(self, admin_client, user,
+                                              user_client):
+        data = {'name': 'Фильм', 'slug': 'films'}
+        response = user_client.post(self.CATEGORIES_URL, data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = user_client.post(self.CATEGORIES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что после изменения роли пользователя закешированные '
+            'данные пользователя сбрасываются.'
+        )
+
+    def test_03_current_user_full_data(self, user_client, user):
+        user_client.get(self.CATEGORIES_URL)
+        response = user_client.get(self.USERS_ME_URL)
+        assert response.json()['email'] == user.email
+        assert response.json()['bio'] == user.bio
+
+    def get_role_token_client(self, user):
+        client = APIClient()
+        user.confirmation_code = 'CODE123456'
+        user.save()
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': user.confirmation_code
+        })
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что POST-запрос к `/api/v1/auth/token/` с верным '
+            'кодом подтверждения возвращает токен.'
+        )
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+        )
+        return client
+
+    def test_04_role_claims_token(self, admin):
+        admin_client = self.get_role_token_client(admin)
+        data = {'name': 'Фильм', 'slug': 'films'}
+        admin_client.get(self.CATEGORIES_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.CATEGORIES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert not user_queries(context), (
+            'Проверьте, что права пользователя проверяются по данным '
+            'токена без обращения к таблице пользователей.'
+        )
+
+    def test_05_role_change_revokes_token(self, admin_client, user):
+        user_client = self.get_role_token_client(user)
+        assert user_client.get(self.USERS_ME_URL).status_code == HTTPStatus.OK
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = user_client.get(self.USERS_ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после изменения роли пользователя ранее '
+            'выданные токены с ролью отзываются.'
+        )
+
+    def test_06_snapshot_in_auth_cache(self, user_client, user):
+        user_client.get(self.CATEGORIES_URL)
+        key = get_snapshot_key(user.id)
+        assert caches['auth'].get(key) is not None, (
+            'Проверьте, что данные пользователя кешируются в кеше `auth`, '
+            'который можно сделать общим для всех процессов.'
+        )
+        assert caches['default'].get(key) is None
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Categorie
+from tests.utils import create_categories
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13CatalogCache:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    STATS_URL = '/api/v1/catalog-cache/'
+
+    def test_01_categories_cached(self, client, admin_client):
+        create_categories(admin_client)
+        url = self.CATEGORIES_URL + '?search=Фильм'
+        first = client.get(url).json()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == first
+        assert not any(
+            'reviews_categorie' in query['sql']
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что повторный GET-запрос к `{self.CATEGORIES_URL}` '
+            'обслуживается из кеша без запросов к таблице категорий.'
+        )
+        stats = admin_client.get(self.STATS_URL).json()
+        assert stats == {'hits': 1, 'misses': 1}
+
+    def test_02_cache_invalidated_on_create_and_delete(self, client,
+                                                       admin_client):
+        categories = create_categories(admin_client)
+        assert client.get(self.CATEGORIES_URL).json()['count'] == 2
+        admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        assert client.get(self.CATEGORIES_URL).json()['count'] == 3, (
+            'Проверьте, что кеш списка категорий сбрасывается при создании '
+            'категории.'
+        )
+        admin_client.delete(f'{self.CATEGORIES_URL}{categories[0]["slug"]}/')
+        assert client.get(self.CATEGORIES_URL).json()['count'] == 2, (
+            'Проверьте, что кеш списка категорий сбрасывается при удалении '
+            'категории.'
+        )
+
+    def test_03_stats_admin_only(self, client, user_client):
+        assert client.get(self.STATS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.STATS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+
+    def test_04_cache_follows_database_version(self, client, admin_client):
+        create_categories(admin_client)
+        response = client.get(self.CATEGORIES_URL)
+        etag = response['ETag']
+        Categorie.objects.create(name='Музыка', slug='music')
+        response = client.get(self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 3, (
+            'Проверьте, что ключ кеша справочника строится по версии данных '
+            'в базе: изменение, сделанное другим процессом, должно '
+            'сбрасывать кеш вместе с ETag.'
+        )
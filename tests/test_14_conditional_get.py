@@ -0,0 +1,131 @@
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from reviews.models import ResourceVersion
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_titles_not_modified(self, client, admin_client, admin,
+                                    user, user_client):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        response = client.get(self.TITLES_URL)
+        etag = response['ETag']
+        assert etag and response.has_header('Last-Modified'), (
+            f'Проверьте, что ответ на GET-запрос к `{self.TITLES_URL}` '
+            'содержит заголовки `ETag` и `Last-Modified`.'
+        )
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что при совпадении `If-None-Match` возвращается '
+            'ответ со статусом 304.'
+        )
+
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        review_etag = client.get(url)['ETag']
+        user_client.delete(f'{url}{user.reviews.get().id}/')
+        assert client.get(
+            self.TITLES_URL, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что после удаления отзыва список произведений '
+            'считается изменённым.'
+        )
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=review_etag
+        ).status_code == HTTPStatus.OK
+
+    def test_02_if_modified_since(self, client, admin_client):
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'}
+        )
+        response = client.get('/api/v1/genres/')
+        response = client.get(
+            '/api/v1/genres/',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_03_reviews_etag_ignores_signups(self, client, admin_client,
+                                             admin, user, user_client):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = client.get(url)['ETag']
+        data = {'username': 'newcomer', 'email': 'newcomer@yamdb.fake'}
+        client.post('/api/v1/auth/signup/', data=data)
+        client.post('/api/v1/auth/signup/', data=data)
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'bio': 'Новое'}
+        )
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что регистрация и изменение пользователя без смены '
+            'имени не сбрасывают ETag списка отзывов.'
+        )
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что смена имени автора сбрасывает ETag списка '
+            'отзывов.'
+        )
+
+    def test_04_review_writes_skip_shared_counter(self, client, admin_client,
+                                                  user_client):
+        titles, _, _ = create_titles(admin_client)
+        etag = client.get(self.TITLES_URL)['ETag']
+        version = ResourceVersion.objects.get(name='titles').version
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        assert ResourceVersion.objects.get(
+            name='titles'
+        ).version == version, (
+            'Проверьте, что запись отзыва не обновляет общий счётчик '
+            'версии произведений.'
+        )
+        assert client.get(
+            self.TITLES_URL, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что после нового отзыва список произведений '
+            'считается изменённым.'
+        )
+
+    def test_05_titles_etag_ignores_clock(self, client, admin_client,
+                                          user_client, admin, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        frozen = timezone.now()
+        monkeypatch.setattr(timezone, 'now', lambda: frozen)
+        detail_url = f'{self.TITLES_URL}{titles[1]["id"]}/'
+        list_etag = client.get(self.TITLES_URL)['ETag']
+        detail_etag = client.get(detail_url)['ETag']
+        for title, author_client in zip(titles, (user_client, admin_client)):
+            url = self.REVIEWS_URL_TEMPLATE.format(title_id=title['id'])
+            response = author_client.post(
+                url, data={'text': 'Отзыв', 'score': 3}
+            )
+            assert response.status_code == HTTPStatus.CREATED
+            response = client.get(
+                self.TITLES_URL, HTTP_IF_NONE_MATCH=list_etag
+            )
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что каждый новый отзыв меняет ETag списка '
+                'произведений независимо от времени на сервере.'
+            )
+            list_etag = response['ETag']
+        assert client.get(
+            detail_url, HTTP_IF_NONE_MATCH=detail_etag
+        ).status_code == HTTPStatus.OK
@@ -0,0 +1,85 @@
+import smtplib
+import socket
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import CommandError, call_command
+
+from reviews.models import OutgoingEmail
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    SIGNUP_DATA = {'email': 'valid@yamdb.fake', 'username': 'valid-username'}
+
+    def test_01_signup_queues_email(self, client, settings):
+        settings.CONFIRMATION_EMAIL_DELIVERY = 'outbox'
+        response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что в режиме `outbox` письмо не отправляется '
+            'во время запроса регистрации.'
+        )
+        assert OutgoingEmail.objects.filter(
+            recipient=self.SIGNUP_DATA['email']
+        ).exists()
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [self.SIGNUP_DATA['email']]
+        assert OutgoingEmail.objects.get().sent is not None
+
+    def test_02_failed_email_retried(self, client, settings, monkeypatch):
+        settings.CONFIRMATION_EMAIL_DELIVERY = 'outbox'
+        client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+
+        def broken_send(self, messages):
+            raise smtplib.SMTPServerDisconnected('Сервер недоступен')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', broken_send)
+        call_command('send_emails')
+        email = OutgoingEmail.objects.get()
+        assert email.sent is None and email.attempts == 1
+        assert 'Сервер недоступен' in email.last_error
+
+        monkeypatch.undo()
+        OutgoingEmail.objects.update(send_after=email.created)
+        call_command('send_emails')
+        assert OutgoingEmail.objects.get().sent is not None, (
+            'Проверьте, что неотправленное письмо отправляется повторно.'
+        )
+
+    def test_03_unreachable_server_postpones_batch(self, client, settings):
+        settings.CONFIRMATION_EMAIL_DELIVERY = 'outbox'
+        client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        with socket.socket() as closed_socket:
+            closed_socket.bind(('127.0.0.1', 0))
+            port = closed_socket.getsockname()[1]
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+        settings.EMAIL_HOST = '127.0.0.1'
+        settings.EMAIL_PORT = port
+        settings.EMAIL_TIMEOUT = 1
+
+        call_command('send_emails')
+        email = OutgoingEmail.objects.get()
+        assert email.sent is None and email.attempts == 1, (
+            'Проверьте, что при недоступном почтовом сервере команда '
+            '`send_emails` не падает, а откладывает письма.'
+        )
+        assert email.last_error
+        assert email.send_after > email.created
+
+    @pytest.mark.parametrize('option', ('--batch-size', '--max-attempts'))
+    @pytest.mark.parametrize('value', ('0', '-5'))
+    def test_04_invalid_batch_options(self, client, settings, option, value):
+        settings.CONFIRMATION_EMAIL_DELIVERY = 'outbox'
+        client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        with pytest.raises(CommandError):
+            call_command('send_emails', f'{option}={value}')
+        assert OutgoingEmail.objects.get().attempts == 0, (
+            f'Проверьте, что команда `send_emails` отклоняет `{option}` '
+            'меньше единицы до начала отправки.'
+        )
@@ -0,0 +1,67 @@
+import pytest
+
+from reviews.models import Categorie, Genre, Title
+
+
+def create_filter_titles():
+    films = Categorie.objects.create(name='Фильм', slug='films')
+    books = Categorie.objects.create(name='Книга', slug='books')
+    horror = Genre.objects.create(name='Ужасы', slug='horror')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    for name, year, category, genres in (
+        ('Сияние', 1980, films, [horror]),
+        ('Мастер и Маргарита', 1967, books, [comedy, horror]),
+        ('Сияние', 1977, books, [horror]),
+        ('Иван Васильевич', 1973, films, [comedy]),
+    ):
+        title = Title.objects.create(name=name, year=year, category=category)
+        title.genre.set(genres)
+
+
+def get_years(client, query):
+    response = client.get(f'/api/v1/titles/?{query}')
+    assert response.status_code == 200
+    return sorted(title['year'] for title in response.json()['results'])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleFilters:
+
+    def test_01_exact_filters(self, client):
+        create_filter_titles()
+        assert get_years(client, 'category=film') == [], (
+            'Проверьте, что фильтр `category` сравнивает метку категории '
+            'точно, а не по вхождению подстроки.'
+        )
+        assert get_years(client, 'genre=horr') == [], (
+            'Проверьте, что фильтр `genre` сравнивает метку жанра точно.'
+        )
+        assert get_years(client, 'year=19') == [], (
+            'Проверьте, что фильтр `year` сравнивает год точно.'
+        )
+        assert get_years(client, 'year=1977') == [1977]
+        assert get_years(client, 'category=films') == [1973, 1980]
+
+    def test_02_in_filters(self, client):
+        create_filter_titles()
+        assert get_years(client, 'genre__in=horror,comedy') == [
+            1967, 1973, 1977, 1980
+        ], (
+            'Проверьте, что фильтр `genre__in` возвращает каждое '
+            'произведение один раз.'
+        )
+        assert get_years(client, 'category__in=films,books') == [
+            1967, 1973, 1977, 1980
+        ]
+        assert get_years(client, 'year__in=1967,1980') == [1967, 1980]
+
+    def test_03_substring_and_range_filters(self, client):
+        create_filter_titles()
+        assert get_years(client, 'category__icontains=FILM') == [1973, 1980]
+        assert get_years(client, 'genre__icontains=o') == [
+            1967, 1973, 1977, 1980
+        ]
+        assert get_years(client, 'year__gte=1970&year__lte=1979') == [
+            1973, 1977
+        ]
+        assert get_years(client, 'name=Сияние&year__lte=1979') == [1977]
@@ -0,0 +1,83 @@
+import pytest
+from django.db import connection
+
+from reviews.models import Title
+from reviews.search import SEARCH_TABLE, rebuild_search_index
+
+
+def search(client, query):
+    response = client.get('/api/v1/titles/', {'search': query})
+    assert response.status_code == 200
+    return [title['name'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_search_name_and_description(self, client):
+        Title.objects.create(
+            name='Солярис', year=1972,
+            description='Фантастическая драма об океане.'
+        )
+        Title.objects.create(
+            name='Океан', year=2009,
+            description='Документальный фильм: океан, океан и ещё раз океан.'
+        )
+        Title.objects.create(name='Сталкер', year=1979)
+        assert search(client, 'океан') == ['Океан', 'Солярис'], (
+            f'Проверьте, что параметр `search` эндпоинта `{self.TITLES_URL}` '
+            'ищет слова в названии и описании и сортирует результаты '
+            'по релевантности.'
+        )
+        assert search(client, 'ОКЕАН драма') == ['Солярис'], (
+            'Проверьте, что поиск регистронезависим и требует совпадения '
+            'всех слов запроса.'
+        )
+        assert search(client, '"океан* -(:') == ['Океан', 'Солярис'], (
+            'Проверьте, что служебные символы в поисковом запросе '
+            'не приводят к ошибке.'
+        )
+        assert search(client, '!!!') == []
+
+    def test_02_search_index_follows_changes(self, client, admin_client):
+        title = Title.objects.create(name='Сталкер', year=1979)
+        assert search(client, 'сталкер') == ['Сталкер']
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{title.id}/',
+            data={'name': 'Зеркало'}
+        )
+        assert response.status_code == 200
+        assert search(client, 'сталкер') == [], (
+            'Проверьте, что после изменения произведения старое название '
+            'не находится поиском.'
+        )
+        assert search(client, 'зеркало') == ['Зеркало']
+        admin_client.delete(f'{self.TITLES_URL}{title.id}/')
+        assert search(client, 'зеркало') == [], (
+            'Проверьте, что удалённое произведение не находится поиском.'
+        )
+
+    def test_03_rebuild_search_index(self, client):
+        Title.objects.bulk_create([
+            Title(name='Сталкер', year=1979),
+            Title(name='Зеркало', year=1975),
+        ])
+        assert search(client, 'зеркало') == []
+        rebuild_search_index()
+        assert search(client, 'зеркало') == ['Зеркало']
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='Таблица FTS5 есть только на SQLite'
+    )
+    def test_04_search_uses_fts_table(self, client):
+        Title.objects.create(name='Сталкер', year=1979)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'EXPLAIN QUERY PLAN SELECT rowid FROM {SEARCH_TABLE} '
+                f'WHERE {SEARCH_TABLE} MATCH %s', ['"сталкер"']
+            )
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        assert 'VIRTUAL TABLE INDEX' in plan
@@ -0,0 +1,89 @@
+import pytest
+from django.db import connection
+
+from reviews.models import User
+from reviews.search import rebuild_user_search_index
+from tests.utils import create_users_in_db
+
+USERNAMES = ('Alice', 'alina_k', 'malice', 'bob', 'al.ex')
+
+
+def search(admin_client, query):
+    response = admin_client.get('/api/v1/users/', query)
+    assert response.status_code == 200
+    return sorted(user['username'] for user in response.json()['results'])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18UsernameSearch:
+
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_prefix_search(self, admin_client):
+        create_users_in_db(USERNAMES)
+        assert search(admin_client, {'search': 'al'}) == [
+            'Alice', 'al.ex', 'alina_k'
+        ], (
+            f'Проверьте, что поиск `{self.USERS_URL}?search=` по умолчанию '
+            'ищет пользователей по началу имени без учёта регистра.'
+        )
+        assert search(admin_client, {'search': 'ALI'}) == [
+            'Alice', 'alina_k'
+        ]
+        assert search(admin_client, {'search': 'al_'}) == [], (
+            'Проверьте, что символ `_` в запросе не считается шаблоном.'
+        )
+
+    def test_02_contains_search(self, admin_client):
+        create_users_in_db(USERNAMES)
+        assert search(
+            admin_client, {'search': 'LIC', 'search_mode': 'contains'}
+        ) == ['Alice', 'malice'], (
+            f'Проверьте, что `{self.USERS_URL}?search_mode=contains` ищет '
+            'подстроку в любом месте имени без учёта регистра.'
+        )
+        assert search(
+            admin_client, {'search': 'a_k', 'search_mode': 'contains'}
+        ) == ['alina_k']
+        assert search(
+            admin_client, {'search': 'o', 'search_mode': 'contains'}
+        ) == ['bob']
+        response = admin_client.get(
+            self.USERS_URL, {'search': 'al', 'search_mode': 'fuzzy'}
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что неизвестный режим поиска возвращает статус 400.'
+        )
+
+    def test_03_search_index_follows_changes(self, admin_client):
+        create_users_in_db(USERNAMES)
+        admin_client.patch(
+            f'{self.USERS_URL}malice/', data={'username': 'bobby'}
+        )
+        admin_client.delete(f'{self.USERS_URL}Alice/')
+        assert search(
+            admin_client, {'search': 'lic', 'search_mode': 'contains'}
+        ) == [], (
+            'Проверьте, что поиск подстроки учитывает изменение '
+            'и удаление пользователей.'
+        )
+        assert search(
+            admin_client, {'search': 'bob', 'search_mode': 'contains'}
+        ) == ['bob', 'bobby']
+        User.objects.bulk_create([
+            User(username='alicia', email='alicia@yamdb.fake')
+        ])
+        rebuild_user_search_index()
+        assert search(
+            admin_client, {'search': 'lic', 'search_mode': 'contains'}
+        ) == ['alicia']
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='Индекс COLLATE NOCASE создаётся только на SQLite'
+    )
+    def test_04_prefix_search_uses_index(self):
+        plan = User.objects.filter(username__istartswith='al_').explain()
+        assert 'reviews_user_username_ci_idx' in plan, (
+            'Проверьте, что поиск по началу имени использует индекс.'
+        )
@@ -0,0 +1,49 @@
+import pytest
+from django.db import connection
+
+from reviews.signals import configure_sqlite
+
+
+def get_pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Параметры соединения задаются только для SQLite'
+)
+@pytest.mark.django_db(transaction=True)
+class Test19SQLiteSettings:
+
+    def test_01_connection_uses_pragmas(self, settings):
+        assert get_pragma('synchronous') == 1, (
+            'Проверьте, что новому соединению с SQLite задаётся '
+            '`synchronous = NORMAL`.'
+        )
+        assert get_pragma('cache_size') == int(
+            settings.SQLITE_PRAGMAS['cache_size']
+        )
+        assert get_pragma('busy_timeout') == int(
+            settings.SQLITE_PRAGMAS['busy_timeout']
+        )
+
+    def test_02_pragmas_from_settings(self, settings):
+        original_pragmas = settings.SQLITE_PRAGMAS
+        settings.SQLITE_PRAGMAS = {
+            'synchronous': 'full',
+            'cache_size': '-1000',
+            'busy_timeout': '',
+        }
+        busy_timeout = get_pragma('busy_timeout')
+        configure_sqlite(sender=None, connection=connection)
+        try:
+            assert get_pragma('synchronous') == 2
+            assert get_pragma('cache_size') == -1000
+            assert get_pragma('busy_timeout') == busy_timeout, (
+                'Проверьте, что параметр с пустым значением не меняется.'
+            )
+        finally:
+            settings.SQLITE_PRAGMAS = original_pragmas
+            configure_sqlite(sender=None, connection=connection)
@@ -0,0 +1,111 @@
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import CachedUserJWTAuthentication, get_token_version
+from api.replicas import (
+    PIN_COOKIE, ReplicaMiddleware, ReplicaRouter, RoutingState, routing_state
+)
+from reviews.models import Title
+
+
+def route(method, write=False, cookies=None):
+    """
+    Выполняет запрос через ReplicaMiddleware и возвращает базы,
+    выбранные роутером для чтения до и после записи, и ответ.
+    """
+    router = ReplicaRouter()
+    databases = []
+
+    def get_response(request):
+        databases.append(router.db_for_read(Title))
+        if write:
+            router.db_for_write(Title)
+            databases.append(router.db_for_read(Title))
+        return HttpResponse()
+
+    request = getattr(RequestFactory(), method)('/api/v1/titles/')
+    request.COOKIES.update(cookies or {})
+    response = ReplicaMiddleware(get_response)(request)
+    return databases, response
+
+
+class Test21ReplicaRouting:
+
+    @pytest.fixture(autouse=True)
+    def replica(self, settings):
+        settings.REPLICA_DATABASE = 'replica'
+
+    def test_01_safe_reads_use_replica(self):
+        for method in ('get', 'head', 'options'):
+            databases, response = route(method)
+            assert databases == ['replica'], (
+                f'Проверьте, что при {method.upper()}-запросе чтение '
+                'выполняется с реплики.'
+            )
+            assert PIN_COOKIE not in response.cookies
+
+    def test_02_writes_use_primary(self):
+        databases, response = route('post', write=True)
+        assert databases == [None, None], (
+            'Проверьте, что при POST-запросе чтение выполняется '
+            'из основной базы.'
+        )
+        assert response.cookies[PIN_COOKIE]['max-age'], (
+            'Проверьте, что после записи клиент получает cookie, '
+            'закрепляющую чтение за основной базой.'
+        )
+        assert ReplicaRouter().db_for_write(Title) is None
+
+    def test_03_read_after_write_uses_primary(self):
+        databases, response = route('get', write=True)
+        assert databases == ['replica', None], (
+            'Проверьте, что после записи чтение в том же запросе '
+            'выполняется из основной базы.'
+        )
+        databases, _ = route(
+            'get', cookies={PIN_COOKIE: response.cookies[PIN_COOKIE].value}
+        )
+        assert databases == [None], (
+            'Проверьте, что после записи следующие запросы клиента '
+            'читают из основной базы.'
+        )
+
+    def test_04_without_replica_or_request(self, settings):
+        assert ReplicaRouter().db_for_read(Title) is None, (
+            'Проверьте, что вне запроса чтение идёт в основную базу.'
+        )
+        settings.REPLICA_DATABASE = None
+        databases, response = route('get', write=True)
+        assert databases == [None, None]
+        assert PIN_COOKIE not in response.cookies
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_api_write_pins_client(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == 201
+        assert PIN_COOKIE in response.cookies, (
+            'Проверьте, что ответ на запрос с записью в базу закрепляет '
+            'клиента за основной базой.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_auth_reads_use_primary(self, user):
+        token = routing_state.set(RoutingState(use_replica=True))
+        try:
+            assert get_token_version(user.id) == user.token_version, (
+                'Проверьте, что версия токенов читается из основной базы.'
+            )
+            authenticated = CachedUserJWTAuthentication().get_user(
+                AccessToken.for_user(user)
+            )
+        finally:
+            routing_state.reset(token)
+        assert authenticated.pk == user.pk
+        assert authenticated._state.db == 'default', (
+            'Проверьте, что пользователь для проверки прав загружается '
+            'из основной базы, а не с реплики.'
+        )
@@ -0,0 +1,139 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title, TitleStats
+from tests.utils import create_reviews_in_db
+
+
+def get_stats(client, title_id):
+    response = client.get(f'/api/v1/titles/{title_id}/stats/')
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleStats:
+
+    STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+
+    def test_01_stats_follow_review_writes(self, client, user_client,
+                                           admin_client):
+        title = Title.objects.create(name='Сталкер', year=1979)
+        url = self.STATS_URL_TEMPLATE.format(title_id=title.id)
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        stats = get_stats(client, title.id)
+        assert stats == {
+            'review_count': 0,
+            'rating': None,
+            'scores': {str(score): 0 for score in range(1, 11)},
+            'latest_review': None,
+        }, (
+            f'Проверьте, что GET-запрос к `{url}` для произведения без '
+            'отзывов возвращает нулевую статистику.'
+        )
+        create_reviews_in_db(title, [10, 6])
+        response = user_client.post(
+            reviews_url, data={'text': 'Отзыв', 'score': 8}
+        )
+        assert response.status_code == 201
+        latest = response.json()
+        stats = get_stats(client, title.id)
+        assert stats['review_count'] == 3
+        assert stats['rating'] == 8
+        assert stats['scores']['10'] == stats['scores']['6'] == 1
+        assert stats['scores']['8'] == 1
+        assert stats['latest_review'] == latest['pub_date'], (
+            f'Проверьте, что `{url}` возвращает дату последнего отзыва.'
+        )
+
+        admin_client.patch(
+            f'{reviews_url}{latest["id"]}/', data={'score': 2}
+        )
+        stats = get_stats(client, title.id)
+        assert (stats['scores']['8'], stats['scores']['2']) == (0, 1), (
+            'Проверьте, что изменение оценки переносит её '
+            'в гистограмме статистики.'
+        )
+        admin_client.delete(f'{reviews_url}{latest["id"]}/')
+        stats = get_stats(client, title.id)
+        assert stats['review_count'] == 2
+        assert stats['scores']['2'] == 0
+        assert stats['latest_review'] != latest['pub_date'], (
+            'Проверьте, что после удаления последнего отзыва дата '
+            'последнего отзыва берётся из оставшихся отзывов.'
+        )
+        assert stats['latest_review'] is not None
+
+    def test_02_stats_single_query(self, client):
+        title = Title.objects.create(name='Сталкер', year=1979)
+        create_reviews_in_db(title, [1, 2, 3])
+        url = self.STATS_URL_TEMPLATE.format(title_id=title.id)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200
+        assert len(context.captured_queries) == 1, (
+            f'Проверьте, что GET-запрос к `{url}` читает одну строку '
+            'заранее посчитанной статистики.'
+        )
+
+    def test_03_missing_stats_and_rebuild(self, client):
+        Title.objects.bulk_create([Title(name='Зеркало', year=1975)])
+        title = Title.objects.get()
+        reviews = create_reviews_in_db(title, [4, 4, 9])
+        TitleStats.objects.all().delete()
+        stats = get_stats(client, title.id)
+        assert stats['review_count'] == 3, (
+            'Проверьте, что статистика произведения без строки '
+            'статистики считается по отзывам.'
+        )
+        assert stats['scores']['4'] == 2
+        assert not TitleStats.objects.exists(), (
+            'Проверьте, что GET-запрос статистики не записывает в базу.'
+        )
+        TitleStats.rebuild()
+        TitleStats.objects.filter(title=title).update(review_count=0)
+        TitleStats.rebuild([title.id])
+        stats = TitleStats.objects.get(title=title)
+        assert stats.review_count == 3
+        assert stats.latest_review == max(
+            review.pub_date for review in reviews
+        )
+        assert client.get(
+            self.STATS_URL_TEMPLATE.format(title_id=title.id + 1)
+        ).status_code == 404
+
+    def test_04_stats_after_author_deleted(self, client, admin_client):
+        title = Title.objects.create(name='Сталкер', year=1979)
+        reviews = create_reviews_in_db(title, [3, 7])
+        response = admin_client.delete(
+            f'/api/v1/users/{reviews[1].author.username}/'
+        )
+        assert response.status_code == 204
+        stats = get_stats(client, title.id)
+        assert stats['review_count'] == 1, (
+            'Проверьте, что при удалении пользователя его отзывы '
+            'вычитаются из статистики произведения.'
+        )
+        assert (stats['scores']['3'], stats['scores']['7']) == (1, 0)
+        assert stats['latest_review'] is not None
+        Title.objects.get().delete()
+        assert not TitleStats.objects.exists()
+
+    def test_05_stats_follow_orm_writes(self, user):
+        title = Title.objects.create(name='Солярис', year=1972)
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=3
+        )
+        review.score = 8
+        review.save(update_fields=['score'])
+        stats = TitleStats.objects.get(title=title)
+        assert (stats.review_count, stats.score_3, stats.score_8) == (
+            1, 0, 1
+        ), (
+            'Проверьте, что статистика обновляется при создании '
+            'и изменении отзыва не только через API.'
+        )
+        user.delete()
+        stats.refresh_from_db()
+        assert (stats.review_count, stats.score_8) == (0, 0)
@@ -1,5 +1,7 @@
 from http import HTTPStatus
 
+from reviews.models import Categorie, Genre, Review, Title, User
+
 
 check_name_and_slug_patterns = (
     (
@@ -281,6 +283,42 @@ def create_comments(admin_client, authors_map):
     return result, reviews, titles
 
 
+def create_users_in_db(usernames):
+    return [
+        User.objects.create(username=username, email=f'{username}@yamdb.fake')
+        for username in usernames
+    ]
+
+
+def create_titles_in_db(count):
+    category = Categorie.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name='Ужасы', slug='horror'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    result = []
+    for idx in range(count):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+        result.append(title)
+    return result
+
+
+def create_reviews_in_db(title, scores, start=0):
+    """Создаёт по отзыву с каждой оценкой от новых авторов."""
+    authors = create_users_in_db(
+        f'reviewer{idx}' for idx in range(start, start + len(scores))
+    )
+    return [
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=score
+        )
+        for author, score in zip(authors, scores)
+    ]
+
+
 def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
     obj_types = {
         'comment': 'комментария(ев) к отзыву',